@@ -0,0 +1,146 @@
+import asyncio
+
+from blackjack_rules import DEFAULT_RULES, MAX_TABLE_TOTAL, hand_total
+
+# Table entries; the double codes fall back when doubling is not allowed
+STAND, HIT, DOUBLE_OR_HIT, DOUBLE_OR_STAND = range(4)
+ACTION_NAMES = {STAND: 'stand', HIT: 'hit'}
+UPCARD_VALUES = 12  # card values 0..11, only 2..11 are used
+
+
+def policy_index(total, soft, upcard_value):
+    """Return the lookup-table index for a player total, softness and dealer upcard value."""
+    return ((min(total, MAX_TABLE_TOTAL) << 1) | soft) * UPCARD_VALUES + upcard_value
+
+
+def basic_strategy_table():
+    """
+    Build a lookup table of basic strategy for hard and soft totals (no splits).
+    Returns:
+        list[int]: Action codes indexed by policy_index.
+    """
+    table = [STAND] * ((MAX_TABLE_TOTAL + 1) * 2 * UPCARD_VALUES)
+    for upcard in range(2, 12):
+        for total in range(MAX_TABLE_TOTAL + 1):
+            # Hard totals
+            if total <= 8:
+                hard = HIT
+            elif total == 9:
+                hard = DOUBLE_OR_HIT if 3 <= upcard <= 6 else HIT
+            elif total == 10:
+                hard = DOUBLE_OR_HIT if upcard <= 9 else HIT
+            elif total == 11:
+                hard = DOUBLE_OR_HIT if upcard <= 10 else HIT
+            elif total == 12:
+                hard = STAND if 4 <= upcard <= 6 else HIT
+            elif total <= 16:
+                hard = STAND if upcard <= 6 else HIT
+            else:
+                hard = STAND
+            table[policy_index(total, False, upcard)] = hard
+
+            # Soft totals
+            if total <= 12:
+                soft = HIT
+            elif total <= 14:
+                soft = DOUBLE_OR_HIT if 5 <= upcard <= 6 else HIT
+            elif total <= 16:
+                soft = DOUBLE_OR_HIT if 4 <= upcard <= 6 else HIT
+            elif total == 17:
+                soft = DOUBLE_OR_HIT if 3 <= upcard <= 6 else HIT
+            elif total == 18:
+                if 3 <= upcard <= 6:
+                    soft = DOUBLE_OR_STAND
+                else:
+                    soft = STAND if upcard <= 8 else HIT
+            else:
+                soft = STAND
+            table[policy_index(total, True, upcard)] = soft
+    return table
+
+
+class BatchedPolicy:
+    def __init__(self, table=None, rules=DEFAULT_RULES, bet=10):
+        """
+        Initialize a lookup-table policy that answers every pending decision in a process
+        in one batch per event-loop tick.
+        Args:
+            table (list[int], optional): Action codes indexed by policy_index. Defaults to basic strategy.
+            rules (RuleSet, optional): Decides when doubling is allowed. Defaults to DEFAULT_RULES.
+            bet (int, optional): Flat bet placed for every seat. Defaults to 10.
+        """
+        self.table = table if table is not None else basic_strategy_table()
+        self.rules = rules
+        self.bet = bet
+        self._pending = []  # [(index, can_double, future)]
+        self._flush_scheduled = False
+        self.batches = 0
+        self.decisions = 0
+        self._numpy_table = None
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        self._numpy = numpy
+        if numpy is not None:
+            self._numpy_table = numpy.asarray(self.table, dtype=numpy.uint8)
+
+    def request(self, player_hand, dealer_hand, can_afford_double=True):
+        """
+        Queue one decision for the next batch.
+        Args:
+            player_hand (list[Card]): The deciding player's cards.
+            dealer_hand (list[Card]): The dealer's cards; the first is the upcard.
+            can_afford_double (bool, optional): Whether the player has the chips to double. Defaults to True.
+        Returns:
+            asyncio.Future: Resolves to 'hit', 'stand' or 'double'.
+        """
+        total, soft = hand_total(player_hand)
+        index = policy_index(total, soft, dealer_hand[0].value())
+        future = asyncio.get_running_loop().create_future()
+        can_double = can_afford_double and self.rules.can_double_down(player_hand)
+        self._pending.append((index, can_double, future))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+        return future
+
+    def _flush(self):
+        pending, self._pending = self._pending, []
+        self._flush_scheduled = False
+        indexes = [index for index, _, _ in pending]
+        if self._numpy_table is not None:
+            codes = self._numpy_table.take(indexes).tolist()
+        else:
+            table = self.table
+            codes = [table[index] for index in indexes]
+        for code, (_, can_double, future) in zip(codes, pending):
+            if future.cancelled():
+                continue
+            if code >= DOUBLE_OR_HIT:
+                action = 'double' if can_double else ('hit' if code == DOUBLE_OR_HIT else 'stand')
+            else:
+                action = ACTION_NAMES[code]
+            future.set_result(action)
+        self.batches += 1
+        self.decisions += len(pending)
+
+    def strategy_for(self, engine):
+        """
+        Build a player_input_strategy for every seat at a table, backed by this shared policy.
+        Args:
+            engine (GameEngine): The table whose players the policy controls.
+        Returns:
+            dict: Player name -> async input function.
+        """
+        players = {player.name: player for player in engine.players}
+
+        async def respond(prompt):
+            name = prompt.split(',', 1)[0]
+            if 'bet' in prompt:
+                # A short seat bets what it has; an uncoverable bet would be asked for forever
+                return str(min(self.bet, players[name].chips))
+            player = players[name]
+            return await self.request(player.hand, engine.dealer.hand, player.chips >= player.current_bet)
+
+        return {name: respond for name in players}
@@ -0,0 +1,5 @@
+"""
+Benchmark suite for the blackjack game.
+Run the modules from the blackjack_coroutines directory, for example:
+    python -m benchmarks.bench_core --output results/core.json
+"""
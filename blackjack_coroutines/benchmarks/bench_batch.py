@@ -0,0 +1,55 @@
+import argparse
+import asyncio
+import time
+
+from batch_strategy import BatchedPolicy
+from benchmarks.common import quiet, write_results
+from game_engine import GameEngine, create_players, reset_for_new_round
+from player import Player
+from simulation import threshold_strategy
+
+
+async def play_tables(table_count, rounds, make_strategy):
+    """Play rounds on table_count concurrent headless tables and return the elapsed time."""
+    async def run_table(index):
+        engine = GameEngine(table_id=f"bench-{index}")
+        engine.players = create_players([f"T{index}S{seat}" for seat in range(3)])
+        strategy = make_strategy(engine)
+        for _ in range(rounds):
+            await engine.play_round(strategy)
+            reset_for_new_round(engine.players, engine.dealer)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_table(index) for index in range(table_count)))
+    return time.perf_counter() - start
+
+
+def bench(table_count, rounds, make_strategy):
+    previous_delay = Player.DEAL_DELAY
+    Player.DEAL_DELAY = 0
+    try:
+        with quiet():
+            elapsed = asyncio.run(play_tables(table_count, rounds, make_strategy))
+    finally:
+        Player.DEAL_DELAY = previous_delay
+    return {'tables': table_count, 'rounds': rounds, 'elapsed_s': elapsed,
+            'rounds_per_sec': table_count * rounds / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-call and batched strategy decisions across many tables.")
+    parser.add_argument('--tables', type=int, default=1000, help="Concurrent tables.")
+    parser.add_argument('--rounds', type=int, default=5, help="Rounds per table.")
+    parser.add_argument('--output', help="Write JSON results to this file.")
+    args = parser.parse_args()
+    policy = BatchedPolicy()
+    results = {
+        'per_call_threshold': bench(args.tables, args.rounds, threshold_strategy),
+        'batched_lookup': bench(args.tables, args.rounds, policy.strategy_for),
+    }
+    results['batched_lookup']['mean_batch_size'] = policy.decisions / policy.batches if policy.batches else 0
+    write_results('batch', results, args.output)
+
+
+if __name__ == "__main__":
+    main()
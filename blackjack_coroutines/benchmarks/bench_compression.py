@@ -0,0 +1,108 @@
+import argparse
+import asyncio
+import time
+import zlib
+
+from benchmarks.common import quiet, write_results
+from compression import FrameCompressor, FrameDecompressor
+from game_engine import GameEngine, create_players, reset_for_new_round
+from host import serialize_game_state
+from network import AsyncServer
+from player import Player
+from simulation import threshold_strategy
+
+
+async def collect_frames(rounds, seats):
+    """Play headless rounds and encode the state frame a host would broadcast at each phase."""
+    server = AsyncServer()
+    engine = GameEngine(table_id="bench")
+    engine.players = create_players([f"Player{seat}" for seat in range(seats)])
+    frames = []
+
+    def capture(engine, settlements):
+        frames.append(server.encode_message(serialize_game_state(engine, 'results')))
+
+    engine.round_listeners.append(capture)
+    strategy = threshold_strategy(engine)
+    for _ in range(rounds):
+        frames.append(server.encode_message(serialize_game_state(engine, 'betting')))
+        await engine.play_round(strategy)
+        frames.append(server.encode_message(serialize_game_state(engine, 'player_action', engine.players[0].name)))
+        reset_for_new_round(engine.players, engine.dealer)
+    return frames
+
+
+class FrameReader:
+    """Minimal stand-in for asyncio.StreamReader over an in-memory buffer."""
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.position = 0
+
+    async def readexactly(self, count):
+        chunk = self.data[self.position:self.position + count]
+        self.position += count
+        return bytes(chunk)
+
+
+def measure(frames, level):
+    """Compress every frame through one persistent per-connection context, then decompress them."""
+    compressor = FrameCompressor(level)
+    start = time.perf_counter()
+    wire = [compressor.compress(frame) for frame in frames]
+    compress_time = time.perf_counter() - start
+
+    async def decode():
+        reader = FrameReader(b''.join(wire))
+        decompressor = FrameDecompressor()
+        return [await decompressor.read_frame(reader) for _ in wire]
+
+    start = time.perf_counter()
+    decoded = asyncio.run(decode())
+    decompress_time = time.perf_counter() - start
+    assert decoded == frames
+    raw_bytes = sum(len(frame) for frame in frames)
+    wire_bytes = sum(len(frame) for frame in wire)
+    return {
+        'level': level,
+        'raw_bytes': raw_bytes,
+        'wire_bytes': wire_bytes,
+        'ratio': wire_bytes / raw_bytes,
+        'compress_us_per_frame': compress_time / len(frames) * 1e6,
+        'decompress_us_per_frame': decompress_time / len(frames) * 1e6,
+    }
+
+
+def measure_stateless(frames, level):
+    """Baseline: compress each frame on its own, without shared history or a dictionary."""
+    start = time.perf_counter()
+    wire = [zlib.compress(frame, level) for frame in frames]
+    elapsed = time.perf_counter() - start
+    raw_bytes = sum(len(frame) for frame in frames)
+    wire_bytes = sum(len(frame) for frame in wire)
+    return {'level': level, 'raw_bytes': raw_bytes, 'wire_bytes': wire_bytes, 'ratio': wire_bytes / raw_bytes,
+            'compress_us_per_frame': elapsed / len(frames) * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CPU cost against bytes saved by frame compression.")
+    parser.add_argument('--rounds', type=int, default=2000, help="Rounds of state frames to generate.")
+    parser.add_argument('--seats', type=int, default=3, help="Players at the table.")
+    parser.add_argument('--output', help="Write JSON results to this file.")
+    args = parser.parse_args()
+    previous_delay = Player.DEAL_DELAY
+    Player.DEAL_DELAY = 0
+    try:
+        with quiet():
+            frames = asyncio.run(collect_frames(args.rounds, args.seats))
+    finally:
+        Player.DEAL_DELAY = previous_delay
+    results = {'frames': len(frames), 'mean_frame_bytes': sum(map(len, frames)) / len(frames)}
+    for level in (1, 6, 9):
+        results[f'streaming_level_{level}'] = measure(frames, level)
+    results['per_frame_zlib_level_6'] = measure_stateless(frames, 6)
+    write_results('compression', results, args.output)
+
+
+if __name__ == "__main__":
+    main()
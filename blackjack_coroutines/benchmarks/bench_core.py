@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from benchmarks.common import quiet, summarize, time_call, write_results
+from blackjack_rules import calculate_hand_value, determine_winners
+from card import Card, Deck
+from game_engine import GameEngine, create_players, reset_for_new_round
+from host import serialize_game_state
+from player import Player
+from simulation import threshold_strategy
+
+
+def random_hands(count, seed=1234):
+    """Build a reproducible list of two to four card hands."""
+    rng = random.Random(seed)
+    cards = list(Card.standard_deck())
+    return [rng.sample(cards, rng.randint(2, 4)) for _ in range(count)]
+
+
+def bench_hand_value(number):
+    hands = random_hands(256)
+    index = [0]
+
+    def run():
+        calculate_hand_value(hands[index[0] & 255])
+        index[0] += 1
+
+    return time_call(run, number=number)
+
+
+def bench_determine_winners(number):
+    hands = random_hands(4)
+    players = [Player(f"P{i}") for i in range(3)]
+    return time_call(lambda: determine_winners(hands[:3], players, hands[3]), number=number)
+
+
+def bench_deck_reset(number):
+    deck = Deck()
+    return time_call(deck.reset, number=max(1, number // 10))
+
+
+def bench_deal_card(number):
+    deck = Deck()
+
+    def run():
+        if len(deck.cards) == 0:
+            deck.reset()
+        deck.deal_card()
+
+    return time_call(run, number=number)
+
+
+async def run_engine_rounds(rounds, player_count=3):
+    engine = GameEngine()
+    engine.players = create_players([f"Bot{i}" for i in range(player_count)])
+    strategy = threshold_strategy(engine)
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await engine.play_round(strategy)
+        reset_for_new_round(engine.players, engine.dealer)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def bench_engine_rounds(rounds):
+    previous_delay = Player.DEAL_DELAY
+    Player.DEAL_DELAY = 0
+    try:
+        with quiet():
+            durations = asyncio.run(run_engine_rounds(rounds))
+    finally:
+        Player.DEAL_DELAY = previous_delay
+    return summarize(durations, rounds=rounds)
+
+
+def bench_serialize_state(number):
+    engine = GameEngine()
+    with quiet():
+        engine.players = create_players(["Alice", "Bob", "Carol"])
+        for player in engine.players:
+            player.hand = [engine.deck.deal_card(), engine.deck.deal_card()]
+            player.current_bet = 25
+        engine.dealer.hand = [engine.deck.deal_card(), engine.deck.deal_card()]
+
+    def run():
+        json.dumps(serialize_game_state(engine, 'player_action', current_player="Bob"))
+
+    return time_call(run, number=number)
+
+
+def run_all(number=10000, rounds=200):
+    """Run every core benchmark and return the results by name."""
+    return {
+        'calculate_hand_value': bench_hand_value(number),
+        'determine_winners': bench_determine_winners(number),
+        'deck_reset': bench_deck_reset(number),
+        'deal_card': bench_deal_card(number),
+        'engine_round': bench_engine_rounds(rounds),
+        'serialize_state_json': bench_serialize_state(number),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rules, deck, engine and serialization hot paths.")
+    parser.add_argument('--number', type=int, default=10000, help="Calls per timing sample.")
+    parser.add_argument('--rounds', type=int, default=200, help="Headless engine rounds to play.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for deck shuffles.")
+    parser.add_argument('--output', help="Write JSON results to this file.")
+    args = parser.parse_args()
+    random.seed(args.seed)
+    write_results('core', run_all(args.number, args.rounds), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import argparse
+
+import event_loop
+from benchmarks.bench_network import bench_round_trip
+from benchmarks.common import write_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare AsyncServer throughput and latency across event loops.")
+    parser.add_argument('--bots', type=int, nargs='+', default=[8, 64], help="Bot counts to test.")
+    parser.add_argument('--requests', type=int, default=200, help="Requests sent to each bot.")
+    parser.add_argument('--output', help="Write JSON results to this file.")
+    args = parser.parse_args()
+    backends = event_loop.available_backends()
+    if 'uvloop' not in backends:
+        print("[Bench] uvloop is not installed; only the asyncio loop will be measured.")
+    results = {
+        f'{backend}_round_trip_{count}_bots': bench_round_trip(count, args.requests, backend)
+        for backend in backends
+        for count in args.bots
+    }
+    write_results('loops', results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.common import quiet, write_results
+from game_engine import GameEngine, create_players
+from host import serialize_game_state
+from player import Player
+
+
+def measure(build):
+    """
+    Measure the memory still allocated after build() returns.
+    Args:
+        build (callable): Function that creates and returns the objects to keep alive.
+    Returns:
+        int: Bytes allocated by build() that are still referenced.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def build_players(count):
+    with quiet():
+        players = [Player(f"Player{index}") for index in range(count)]
+        for player in players:
+            player.place_bet(25)
+    return players
+
+
+def build_tables(count, seats):
+    tables = []
+    with quiet():
+        for index in range(count):
+            engine = GameEngine(table_id=f"table-{index}")
+            engine.players = create_players([f"T{index}P{seat}" for seat in range(seats)])
+            for player in engine.players:
+                player.place_bet(25)
+                player.hand = [engine.deck.deal_card(), engine.deck.deal_card()]
+                player.show_hand()
+            engine.dealer.hand = [engine.deck.deal_card(), engine.deck.deal_card()]
+            tables.append(engine)
+    return tables
+
+
+def build_states(tables):
+    return [serialize_game_state(engine, 'player_action') for engine in tables]
+
+
+def run_all(tables=10000, seats=3):
+    player_bytes = measure(lambda: build_players(tables * seats))
+    table_list = []
+    table_bytes = measure(lambda: table_list.extend(build_tables(tables, seats)) or table_list)
+    state_bytes = measure(lambda: build_states(table_list))
+    return {
+        'seated_player': {'count': tables * seats, 'bytes_each': player_bytes / (tables * seats)},
+        'table': {'count': tables, 'seats': seats, 'bytes_each': table_bytes / tables},
+        'serialized_state': {'count': tables, 'bytes_each': state_bytes / tables},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory per seated player and per table.")
+    parser.add_argument('--tables', type=int, default=10000, help="Concurrent tables to build.")
+    parser.add_argument('--seats', type=int, default=3, help="Players per table.")
+    parser.add_argument('--output', help="Write JSON results to this file.")
+    args = parser.parse_args()
+    write_results('memory', run_all(args.tables, args.seats), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import time
+
+import event_loop
+from benchmarks.common import quiet, summarize, write_results
+from host import get_remote_action_input, get_remote_bet_input
+from network import AsyncClient, AsyncServer, MultiplexClient
+
+
+async def run_bot(client):
+    """Answer every bet and action request immediately."""
+    while True:
+        message = await client.recv_message()
+        if message is None:
+            return
+        if message.get("type") == "bet_request":
+            await client.send_message({"type": "bet_response", "amount": 10})
+        elif message.get("type") == "action_request":
+            await client.send_message({"type": "action_response", "action": "stand"})
+
+
+async def wait_for_players(server, count, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while len(server.clients) < count:
+        if time.perf_counter() > deadline:
+            raise RuntimeError(f"Only {len(server.clients)} of {count} bots joined")
+        await asyncio.sleep(0.01)
+
+
+async def measure_round_trips(bot_count, requests_per_bot, multiplex=False):
+    """
+    Start a local AsyncServer, connect bot clients and time request/response round trips.
+    With multiplex, every bot is a session on one shared connection instead of its own socket.
+    Returns:
+        tuple[list[float], float, float]: Per-request latencies, connect time and total wall time.
+    """
+    # Bots answer far faster than the per-connection rate limit meant for humans allows
+    server = AsyncServer(host='127.0.0.1', port=0, message_rate=None, max_sessions=bot_count if multiplex else 0)
+    server_task = asyncio.create_task(server.start())
+    while server.server is None:
+        await asyncio.sleep(0)
+    port = server.server.sockets[0].getsockname()[1]
+
+    connect_start = time.perf_counter()
+    if multiplex:
+        connection = MultiplexClient('127.0.0.1', port)
+        await connection.connect()
+        clients = [connection.open_session() for _ in range(bot_count)]
+    else:
+        clients = [AsyncClient('127.0.0.1', port) for _ in range(bot_count)]
+    for index, client in enumerate(clients):
+        if not multiplex:
+            await client.connect()
+        await client.send_message({"type": "join", "name": f"Bot{index}"})
+    await wait_for_players(server, bot_count, timeout=max(5.0, bot_count / 1000))
+    connect_time = time.perf_counter() - connect_start
+    bot_tasks = [asyncio.create_task(run_bot(client)) for client in clients]
+
+    async def drive(name):
+        latencies = []
+        for turn in range(requests_per_bot):
+            start = time.perf_counter()
+            if turn % 2 == 0:
+                await get_remote_bet_input(server, name)
+            else:
+                await get_remote_action_input(server, name, f"{name}, choose your action (hit, stand): ")
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    wall_start = time.perf_counter()
+    per_bot = await asyncio.gather(*(drive(f"Bot{i}") for i in range(bot_count)))
+    wall_time = time.perf_counter() - wall_start
+
+    if multiplex:
+        await connection.close()
+    else:
+        for client in clients:
+            client.writer.close()
+    await asyncio.gather(*bot_tasks, return_exceptions=True)
+    server.server.close()
+    server_task.cancel()
+    await asyncio.gather(server_task, return_exceptions=True)
+    return [latency for latencies in per_bot for latency in latencies], connect_time, wall_time
+
+
+def bench_round_trip(bot_count, requests_per_bot, backend='asyncio', multiplex=False):
+    with quiet():
+        latencies, connect_time, wall_time = event_loop.run(
+            measure_round_trips(bot_count, requests_per_bot, multiplex), backend
+        )
+    return summarize(
+        latencies,
+        bots=bot_count,
+        multiplexed=multiplex,
+        loop=event_loop.resolve_backend(backend),
+        connect_time_s=connect_time,
+        connections_per_sec=bot_count / connect_time if connect_time else None,
+        requests_per_sec=len(latencies) / wall_time if wall_time else None,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AsyncServer round-trip latency with local bots.")
+    parser.add_argument('--bots', type=int, nargs='+', default=[1, 8, 32], help="Bot counts to test.")
+    parser.add_argument('--requests', type=int, default=200, help="Requests sent to each bot.")
+    parser.add_argument('--loop', default='asyncio', choices=event_loop.BACKENDS, help="Event loop backend.")
+    parser.add_argument('--multiplex', action='store_true', help="Carry every bot as a session on one connection.")
+    parser.add_argument('--output', help="Write JSON results to this file.")
+    args = parser.parse_args()
+    results = {
+        f'round_trip_{count}_bots': bench_round_trip(count, args.requests, args.loop, args.multiplex)
+        for count in args.bots
+    }
+    write_results('network', results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import summarize, write_results
+
+# Directory holding main.py, so the child interpreter resolves the game modules
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr, top=10):
+    """
+    Parse `python -X importtime` output.
+    Args:
+        stderr (str): The interpreter's stderr.
+        top (int, optional): How many of the slowest modules to keep. Defaults to 10.
+    Returns:
+        tuple[int, list[dict]]: Total cumulative microseconds and the slowest modules by self time.
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append({'module': name.strip(), 'self_us': int(self_us), 'cumulative_us': int(cumulative_us)})
+    # Top-level imports are the ones without indentation in the module column
+    total = sum(module['cumulative_us'] for module in modules if not module['module'].startswith(' '))
+    modules.sort(key=lambda module: module['self_us'], reverse=True)
+    return total, modules[:top]
+
+
+def bench_mode(mode, runs):
+    """
+    Start a fresh interpreter that imports only what a menu mode needs.
+    Args:
+        mode (str): The menu selection passed to main.load_mode.
+        runs (int): Number of interpreter launches to time.
+    Returns:
+        dict: Wall-clock startup timings plus the import-time breakdown of the last run.
+    """
+    code = f"import main; main.load_mode({mode!r})"
+    wall = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=GAME_DIR, check=True)
+        wall.append(time.perf_counter() - start)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=GAME_DIR, check=True, capture_output=True, text=True,
+    )
+    import_total, slowest = parse_importtime(result.stderr)
+    return summarize(wall, mode=mode, import_total_us=import_total, slowest_imports=slowest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure interpreter startup and import time per main.py mode.")
+    parser.add_argument('--runs', type=int, default=10, help="Launches per mode.")
+    parser.add_argument('--output', help="Write JSON results to this file.")
+    args = parser.parse_args()
+    from main import MODES
+    results = {f'startup_mode_{mode}': bench_mode(mode, args.runs) for mode in MODES}
+    write_results('startup', results, args.output)
+
+
+if __name__ == "__main__":
+    main()
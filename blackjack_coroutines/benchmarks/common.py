@@ -0,0 +1,126 @@
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+
+@contextlib.contextmanager
+def quiet():
+    """
+    Silence the game's print() calls while a benchmark runs.
+    Returns:
+        None
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def time_call(func, number=1000, repeat=5):
+    """
+    Time a zero-argument callable.
+    Args:
+        func (callable): The function to time.
+        number (int, optional): Calls per sample. Defaults to 1000.
+        repeat (int, optional): Number of samples. Defaults to 5.
+    Returns:
+        dict: Per-call timings in microseconds and calls per second.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return summarize(samples, number=number)
+
+
+def summarize(samples, **extra):
+    """
+    Summarize a list of per-operation durations given in seconds.
+    Args:
+        samples (list[float]): The measured durations.
+    Returns:
+        dict: Min/median/mean/p95/max in microseconds and operations per second.
+    """
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    best = ordered[0]
+    result = {
+        'samples': len(ordered),
+        'min_us': best * 1e6,
+        'median_us': statistics.median(ordered) * 1e6,
+        'mean_us': statistics.fmean(ordered) * 1e6,
+        'p95_us': p95 * 1e6,
+        'max_us': ordered[-1] * 1e6,
+        'ops_per_sec': (1.0 / best) if best > 0 else None,
+    }
+    result.update(extra)
+    return result
+
+
+def environment():
+    """Describe the interpreter and machine the benchmark ran on."""
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def write_results(suite, results, output=None):
+    """
+    Write benchmark results as JSON so runs can be compared.
+    Args:
+        suite (str): Name of the benchmark suite.
+        results (dict): Benchmark name -> measurements.
+        output (str, optional): File path. Prints to stdout when omitted.
+    Returns:
+        dict: The full report that was written.
+    """
+    report = {
+        'suite': suite,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'environment': environment(),
+        'results': results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if output:
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output, 'w') as handle:
+            handle.write(text + '\n')
+        print(f"[Bench] Wrote {suite} results to {output}")
+    else:
+        print(text)
+    return report
+
+
+def compare_results(baseline_path, current_path, threshold=0.10):
+    """
+    Compare two result files and list benchmarks whose median got slower.
+    Args:
+        baseline_path (str): The earlier results file.
+        current_path (str): The newer results file.
+        threshold (float, optional): Allowed relative slowdown. Defaults to 0.10.
+    Returns:
+        list[tuple[str, float, float]]: (name, baseline median, current median) for each regression.
+    """
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)['results']
+    with open(current_path) as handle:
+        current = json.load(handle)['results']
+    regressions = []
+    for name, measurement in current.items():
+        before = baseline.get(name, {}).get('median_us')
+        after = measurement.get('median_us')
+        if before and after and after > before * (1 + threshold):
+            regressions.append((name, before, after))
+    return regressions
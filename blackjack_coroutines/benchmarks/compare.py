@@ -0,0 +1,22 @@
+import argparse
+import sys
+
+from benchmarks.common import compare_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument('baseline', help="Earlier results JSON.")
+    parser.add_argument('current', help="Newer results JSON.")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Allowed relative slowdown.")
+    args = parser.parse_args()
+    regressions = compare_results(args.baseline, args.current, args.threshold)
+    for name, before, after in regressions:
+        print(f"[Bench] {name} regressed: {before:.2f}us -> {after:.2f}us")
+    if not regressions:
+        print("[Bench] No regressions found.")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -49,7 +49,7 @@ def can_double_down(cards: list[Card]):
   Checks if the player can double down
   - Player can double down if they have exactly two cards and their total value is between 9 and 11
   """
-  return len(cards) == 2 and calculate_hand_value(cards) in range(9, 12)
+  return DEFAULT_RULES.can_double_down(cards)
 
 def calculate_payout(bet: int, result: str):
   """
@@ -59,16 +59,7 @@ def calculate_payout(bet: int, result: str):
   - Push/tie with dealer returns bet
   - Lose returns 0
   """
-  if result == 'win':
-    return bet * 2
-  elif result == 'blackjack':
-    return int(bet * 2.5)
-  elif result == 'push':
-    return bet
-  elif result == 'lose':
-    return 0
-  else:
-    raise ValueError("Invalid result. Must be 'win', 'lose', 'blackjack', or 'push'.")
+  return DEFAULT_RULES.calculate_payout(bet, result)
   
 def determine_winners(player_hands: list[list[Card]], players: list['Player'], dealer_hand: list[Card]):
   """
@@ -112,7 +103,112 @@ def get_valid_actions(player_hand: list[Card], dealer_hand: list[Card]):
   Get the valid actions for the player based on their hand and the dealer's hand.
   - Returns a list of valid actions: 'hit', 'stand', and optionally 'double' if the player can double down.
   """
-  actions = ['hit', 'stand']
-  if can_double_down(player_hand):
-    actions.append('double')
-  return actions
\ No newline at end of file
+  return DEFAULT_RULES.get_valid_actions(player_hand, dealer_hand)
+
+def hand_total(cards: list[Card]):
+  """
+  Calculate the hand value and whether it is soft (an Ace still counted as 11).
+  - Returns a (value, soft) tuple.
+  """
+  value = 0
+  aces = 0
+  for card in cards:
+    card_value = card.value()
+    value += card_value
+    if card_value == 11:
+      aces += 1
+
+  while value > 21 and aces:
+    value -= 10
+    aces -= 1
+
+  return value, aces > 0
+
+# Lookup tables are indexed by hand value; anything above this is bust and treated alike
+MAX_TABLE_TOTAL = 31
+
+class RuleSet:
+  """
+  A table's rule variant, compiled once into lookup tables.
+  - dealer_rule: 'S17' stands on every 17, 'H17' hits soft 17, 'A17' hits every 17 (this game's original rule).
+  - blackjack_payout: Winnings per chip bet on a natural, e.g. 1.5 for 3:2 or 1.2 for 6:5.
+  - double_on: Two-card totals that may double, or None to allow doubling on any two cards.
+  - decks: Number of 52-card decks in the shoe.
+  """
+  DEALER_RULES = ('S17', 'H17', 'A17')
+  __slots__ = ('dealer_rule', 'blackjack_payout', 'double_on', 'decks',
+               'payout_multipliers', 'dealer_hit_table', 'double_table')
+
+  def __init__(self, dealer_rule='A17', blackjack_payout=1.5, double_on=(9, 10, 11), decks=1):
+    if dealer_rule not in self.DEALER_RULES:
+      raise ValueError(f"Invalid dealer rule. Must be one of {', '.join(self.DEALER_RULES)}.")
+    if decks < 1:
+      raise ValueError("A shoe needs at least one deck.")
+    self.dealer_rule = dealer_rule
+    self.blackjack_payout = blackjack_payout
+    self.double_on = None if double_on is None else tuple(sorted(double_on))
+    self.decks = decks
+
+    # Total returned per chip bet, including the original stake
+    self.payout_multipliers = {'win': 2, 'blackjack': 1 + blackjack_payout, 'push': 1, 'lose': 0}
+    # dealer_hit_table[value][soft] -> should the dealer draw
+    self.dealer_hit_table = tuple(
+      (self._dealer_hits(value, False), self._dealer_hits(value, True))
+      for value in range(MAX_TABLE_TOTAL + 1)
+    )
+    self.double_table = tuple(
+      self.double_on is None or value in self.double_on for value in range(MAX_TABLE_TOTAL + 1)
+    )
+
+  def _dealer_hits(self, value, soft):
+    if value < 17:
+      return True
+    if value > 17:
+      return False
+    if self.dealer_rule == 'A17':
+      return True
+    return self.dealer_rule == 'H17' and soft
+
+  def calculate_payout(self, bet: int, result: str):
+    """
+    Calculate the payout for a result under this rule set.
+    - Returns the chips handed back to the player, including the original bet.
+    """
+    try:
+      return int(bet * self.payout_multipliers[result])
+    except KeyError:
+      raise ValueError("Invalid result. Must be 'win', 'lose', 'blackjack', or 'push'.") from None
+
+  def can_double_down(self, cards: list[Card]):
+    """
+    Checks if the player can double down with exactly two cards under this rule set.
+    """
+    return len(cards) == 2 and self.double_table[min(calculate_hand_value(cards), MAX_TABLE_TOTAL)]
+
+  def dealer_should_hit(self, cards: list[Card]):
+    """
+    Determine if the dealer draws another card under this rule set.
+    """
+    value, soft = hand_total(cards)
+    return self.dealer_hit_table[min(value, MAX_TABLE_TOTAL)][soft]
+
+  def get_valid_actions(self, player_hand: list[Card], dealer_hand: list[Card]):
+    """
+    Get the valid actions for the player under this rule set.
+    """
+    if self.can_double_down(player_hand):
+      return ['hit', 'stand', 'double']
+    return ['hit', 'stand']
+
+  def describe(self):
+    """Return a short human-readable summary, e.g. 'A17, BJ pays 3:2, double 9-11, 1 deck'."""
+    ratio = {1.5: '3:2', 1.2: '6:5', 1.0: '1:1', 2.0: '2:1'}.get(self.blackjack_payout, f'{self.blackjack_payout:g}:1')
+    if not self.double_on:
+      double = 'double any' if self.double_on is None else 'no doubling'
+    elif self.double_on == tuple(range(self.double_on[0], self.double_on[-1] + 1)):
+      double = f"double {self.double_on[0]}-{self.double_on[-1]}"
+    else:
+      double = f"double {'/'.join(str(value) for value in self.double_on)}"
+    return f"{self.dealer_rule}, BJ pays {ratio}, {double}, {self.decks} deck{'s' if self.decks > 1 else ''}"
+
+DEFAULT_RULES = RuleSet()
\ No newline at end of file
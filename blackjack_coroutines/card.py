@@ -3,6 +3,8 @@ import random
 class Card:
     SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
     RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+    __slots__ = ('suit', 'rank', '_value', '_text')
+    _standard_deck = None
     
     def __init__(self, suit, rank):
         
@@ -10,33 +12,147 @@ class Card:
         self.rank = rank
         if suit not in self.SUITS or rank not in self.RANKS:
             raise ValueError("Invalid suit or rank")
+        # Cards never change, so the value and display string are computed once
+        if rank in ('J', 'Q', 'K'):
+            self._value = 10
+        elif rank == 'A':
+            self._value = 11
+        else:
+            self._value = int(rank)
+        self._text = f"{rank} of {suit}"
         
     def value(self):
-        if self.rank in ['J', 'Q', 'K']:
-            return 10
-        elif self.rank == 'A':
-            return 11
-        else:
-            return int(self.rank)
+        return self._value
         
     def __str__(self):
-        return f"{self.rank} of {self.suit}"
+        return self._text
+
+    @classmethod
+    def standard_deck(cls):
+        """
+        Return the 52 shared Card instances of a standard deck.
+        Cards are immutable, so every Deck can reference the same objects.
+        """
+        if cls._standard_deck is None:
+            cls._standard_deck = tuple(cls(suit, rank) for suit in cls.SUITS for rank in cls.RANKS)
+        return cls._standard_deck
     
+class ShoeComposition:
+    # Hi-Lo count tag for each rank: low cards +1, tens and aces -1
+    HI_LO = {'2': 1, '3': 1, '4': 1, '5': 1, '6': 1,
+             '7': 0, '8': 0, '9': 0,
+             '10': -1, 'J': -1, 'Q': -1, 'K': -1, 'A': -1}
+    TEN_RANKS = ('10', 'J', 'Q', 'K')
+    __slots__ = ('decks', 'remaining', 'cards_remaining', 'tens_remaining', 'running_count')
+
+    def __init__(self, decks=1):
+        """
+        Initialize a tracker of what is left in the shoe.
+        Args:
+            decks (int, optional): Number of 52-card decks in the shoe. Defaults to 1.
+        """
+        self.reset(decks)
+
+    def reset(self, decks=None):
+        """
+        Restore a full shoe.
+        Args:
+            decks (int, optional): New number of decks. Keeps the current count when omitted.
+        Returns:
+            None
+        """
+        if decks is not None:
+            self.decks = decks
+        per_rank = 4 * self.decks
+        self.remaining = {rank: per_rank for rank in Card.RANKS}
+        self.cards_remaining = per_rank * len(Card.RANKS)
+        self.tens_remaining = per_rank * len(self.TEN_RANKS)
+        self.running_count = 0
+
+    def rebuild(self, cards):
+        """
+        Recompute every count from the cards still in the shoe, e.g. after restoring a snapshot.
+        Args:
+            cards (list[Card]): The cards left in the shoe.
+        Returns:
+            None
+        """
+        self.reset()
+        for rank in Card.RANKS:
+            self.remaining[rank] = 0
+        for card in cards:
+            self.remaining[card.rank] += 1
+        self.cards_remaining = len(cards)
+        self.tens_remaining = sum(self.remaining[rank] for rank in self.TEN_RANKS)
+        # A full shoe counts to zero, so the dealt cards count to minus what is left
+        self.running_count = -sum(self.HI_LO[card.rank] for card in cards)
+
+    def remove(self, card):
+        """
+        Update the counts for a card leaving the shoe.
+        Args:
+            card (Card): The dealt card.
+        Returns:
+            None
+        """
+        rank = card.rank
+        self.remaining[rank] -= 1
+        self.cards_remaining -= 1
+        if rank in self.TEN_RANKS:
+            self.tens_remaining -= 1
+        self.running_count += self.HI_LO[rank]
+
+    def count_of(self, rank):
+        """Return how many cards of rank are left in the shoe."""
+        return self.remaining[rank]
+
+    def decks_remaining(self):
+        """Return the number of decks left, never less than half a deck."""
+        return max(self.cards_remaining / 52, 0.5)
+
+    def true_count(self):
+        """Return the running count divided by the decks remaining."""
+        return self.running_count / self.decks_remaining()
+
+    def snapshot(self):
+        """
+        Return a copy of the current composition for analytics, bots and probability engines.
+        Returns:
+            dict: Per-rank counts, cards and tens remaining, running and true count.
+        """
+        return {
+            'remaining': dict(self.remaining),
+            'cards_remaining': self.cards_remaining,
+            'tens_remaining': self.tens_remaining,
+            'running_count': self.running_count,
+            'true_count': self.true_count(),
+        }
+
 class Deck:
-    def __init__(self):
+    def __init__(self, decks=1):
         # Create and shuffle deck(s)
+        self.decks = decks
+        self.composition = ShoeComposition(decks)
         self.reset()
     
     def reset(self):
         """Reset the deck with a fresh set of cards."""
-        self.cards = [Card(suit, rank) for suit in Card.SUITS for rank in Card.RANKS]
+        self.cards = list(Card.standard_deck()) * self.decks
+        self.composition.reset(self.decks)
         self.shuffle()
     
     def shuffle(self):
+        """
+        Shuffle the cards left in the shoe and recount them, so the composition also matches
+        after the card list was edited directly.
+        """
         random.shuffle(self.cards)
+        self.composition.rebuild(self.cards)
 
     def deal_card(self):
         if not self.cards:
             print("Deck is empty, resetting and reshuffling...")
             self.reset()
-        return self.cards.pop()
\ No newline at end of file
+        card = self.cards.pop()
+        self.composition.remove(card)
+        return card
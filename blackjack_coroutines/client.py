@@ -0,0 +1,165 @@
+import asyncio
+import os
+import time
+from console import async_input
+from network import AsyncClient
+
+async def handle_lobby_messages(client, player_name):
+    """Handle lobby messages from the server."""
+    while True:
+        message = await client.recv_message()
+        if message is None:
+            print("[Client] Disconnected from server.")
+            break
+        
+        message_type = message.get("type")
+        if message_type == "join_ack":
+            players_in_lobby = message.get("players", [])
+            print(f"[Lobby] Current players: {players_in_lobby}")
+        elif message_type == "start":
+            print("[Client] Game is starting!")
+            return  # Exit lobby phase and transition to game phase
+        elif message_type == "state":
+            # If we receive state messages in the lobby, the server might have skipped sending 'start'
+            # Let's consider this as an implicit game start
+            print("[Client] Game is starting! (Implicitly detected from state message)")
+            return
+        else:
+            print(f"[Client] Unexpected message in lobby: {message}")
+
+async def handle_game_state_updates(client, player_name):
+    """Handle game state updates and player interactions."""
+    while True:
+        message = await client.recv_message()
+        if message is None:
+            print("[Client] Disconnected from server.")
+            break
+        message_type = message.get("type")
+        if message_type == "state":
+            display_game_state(message, player_name)
+        elif message_type == "bet_request":
+            await handle_bet_request(client)
+        elif message_type == "action_request":
+            await handle_action_request(client, message)
+        elif message_type == "error":
+            print(f"[Error] {message.get('message')}")
+        else:
+            print(f"[Client] Received unexpected message: {message}")
+
+def display_game_state(game_state, player_name):
+    """Display the current game state to the player."""
+    phase = game_state.get('phase')
+    round_number = game_state.get('round')
+    print(f"\n[Game State] Phase: {phase} | Round: {round_number}")
+
+    # Display players' information
+    for player in game_state.get('players', []):
+        name = player['name']
+        chips = player['chips']
+        hand = player['hand']
+        current_bet = player['current_bet']
+        if name == player_name:
+            print(f"YOU ({name}) - Chips: {chips} | Hand: {hand} | Bet: {current_bet}")
+        else:
+            print(f"{name} - Chips: {chips} | Hand: {hand} | Bet: {current_bet}")
+
+    # Display dealer's hand
+    dealer_hand = game_state.get('dealer', {}).get('hand', '')
+    print(f"Dealer's hand: {dealer_hand}")
+
+    # Highlight when it's the player's turn
+    if game_state.get('current_player') == player_name:
+        print("\n*** IT'S YOUR TURN! ***")
+
+async def handle_bet_request(client):
+    """Handle a bet request from the server."""
+    while True:
+        try:
+            bet_amount = int(await async_input("Place your bet: "))
+            break
+        except ValueError:
+            print("Please enter a valid number.")
+    await client.send_message({"type": "bet_response", "amount": bet_amount})
+
+async def handle_action_request(client, action_message):
+    """Handle an action request from the server."""
+    action_prompt = action_message.get("prompt", "Choose your action: ")
+    action = await async_input(action_prompt)
+    await client.send_message({"type": "action_response", "action": action})
+
+async def join_game():
+    """
+    Client flow: prompt for IP/port and name, connect to server, send name, handle lobby and game state updates.
+    - If an established connection drops, rejoin for up to BLACKJACK_RECONNECT_WINDOW seconds (default 30).
+    """
+    player_name = await async_input("Enter your name: ")
+    server_ip = await async_input("Enter server IP (default 127.0.0.1): ") or "127.0.0.1"
+    port_input = await async_input("Enter server port (default 8765): ") or "8765"
+    try:
+        server_port = int(port_input)
+    except ValueError:
+        print("Invalid port. Exiting.")
+        return
+
+    # After losing an established connection, keep rejoining under the same name so a
+    # restarted server can hand back our seat
+    reconnect_window = float(os.environ.get('BLACKJACK_RECONNECT_WINDOW', 30.0))
+    reconnect_deadline = None
+    while True:
+        client = AsyncClient(server_ip, server_port, compression=os.environ.get('BLACKJACK_COMPRESSION') == '1')
+        try:
+            await client.connect()
+            await client.send_message({"type": "join", "name": player_name.strip()})
+            if reconnect_deadline is None:
+                print("[Client] Waiting for host to start the game...")
+            else:
+                print("[Client] Reconnected, waiting for a seat...")
+                reconnect_deadline = None
+            await handle_lobby_messages(client, player_name)
+            await handle_game_state_updates(client, player_name)
+        except OSError as error:
+            if reconnect_deadline is None:
+                print(f"[Client] Error: {error}")
+                return
+        except Exception as error:
+            print(f"[Client] Error: {error}")
+            return
+        if reconnect_deadline is None:
+            reconnect_deadline = time.monotonic() + reconnect_window
+        if time.monotonic() > reconnect_deadline:
+            print("[Client] Server did not come back. Exiting.")
+            return
+        await asyncio.sleep(1.0)
+
+async def spectate_game():
+    """
+    Spectator flow: prompt for IP/port and table, connect to server and display every state update.
+    """
+    server_ip = await async_input("Enter server IP (default 127.0.0.1): ") or "127.0.0.1"
+    port_input = await async_input("Enter server port (default 8765): ") or "8765"
+    try:
+        server_port = int(port_input)
+    except ValueError:
+        print("Invalid port. Exiting.")
+        return
+    # Hosted and unattended games run the table 'local'; a lobby runs 'table-1', 'table-2', ...
+    table_id = (await async_input("Enter table to watch (default local): ")).strip() or "local"
+
+    client = AsyncClient(server_ip, server_port, compression=os.environ.get('BLACKJACK_COMPRESSION') == '1')
+    try:
+        await client.connect()
+        await client.send_message({"type": "spectate", "table": table_id})
+        while True:
+            message = await client.recv_message()
+            if message is None:
+                print("[Client] Disconnected from server.")
+                break
+            if message.get("type") == "state":
+                display_game_state(message, None)
+            elif message.get("type") == "spectate_ack":
+                tables = ', '.join(message.get("tables", [])) or 'none yet'
+                print(f"[Client] Watching {message.get('table')} (open tables: {tables}). Press Ctrl+C to leave.")
+            elif message.get("type") == "error":
+                print(f"[Error] {message.get('message')}")
+    except Exception as error:
+        print(f"[Client] Error: {error}")
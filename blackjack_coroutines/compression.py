@@ -0,0 +1,92 @@
+import struct
+import zlib
+
+from card import Card
+
+# Name both ends send and accept in the hello handshake
+ALGORITHM = 'zlib'
+# Every compressed frame is a 4-byte big-endian length followed by that many bytes of deflate data
+HEADER = struct.Struct('>I')
+# Each flushed frame ends with this marker; it is stripped on the wire and restored on receipt
+SYNC_MARKER = b'\x00\x00\xff\xff'
+
+
+def preset_dictionary():
+    """
+    Build the preset dictionary shared by both ends: protocol keys, phases and card names.
+    zlib favours the end of the dictionary, so the most frequent strings come last.
+    Returns:
+        bytes: The dictionary.
+    """
+    parts = [
+        '{"type": "join_ack", "players": [', '{"type": "start"}', '{"type": "spectate_ack", "table": ',
+        '{"type": "error", "message": ', '{"type": "bet_request"}',
+        '{"type": "action_request", "prompt": ', ', choose your action (hit, stand): "}',
+        '"phase": "betting"', '"phase": "dealing"', '"phase": "player_action"', '"phase": "dealer"',
+        '"phase": "results"', '[Hidden]', ' | ',
+    ]
+    parts.extend(str(card) + ', ' for card in Card.standard_deck())
+    parts += [
+        '"current_player": null, "round": ', '"current_player": "', ', "round": ',
+        '"dealer": {"hand": "', '"}, ', ', "current_bet": ', '", "chips": ', ', "hand": "',
+        '{"type": "state", "phase": "', '", "players": [{"name": "', '}, {"name": "',
+    ]
+    return ''.join(parts).encode()
+
+
+PRESET_DICTIONARY = preset_dictionary()
+
+
+class FrameCompressor:
+    __slots__ = ('_context',)
+
+    def __init__(self, level=6):
+        """
+        Initialize a per-connection compressor whose history persists across frames, so names
+        and cards repeated from earlier frames cost a back-reference instead of their bytes.
+        Args:
+            level (int, optional): zlib compression level. Defaults to 6.
+        """
+        self._context = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=PRESET_DICTIONARY)
+
+    def compress(self, data):
+        """
+        Compress one encoded frame.
+        Args:
+            data (bytes): A newline-terminated JSON frame.
+        Returns:
+            bytes: The length-prefixed compressed frame.
+        """
+        body = self._context.compress(data) + self._context.flush(zlib.Z_SYNC_FLUSH)
+        body = body[:-len(SYNC_MARKER)]
+        return HEADER.pack(len(body)) + body
+
+
+class FrameDecompressor:
+    __slots__ = ('_context',)
+
+    def __init__(self):
+        """
+        Initialize the receiving side of a FrameCompressor.
+        """
+        self._context = zlib.decompressobj(-zlib.MAX_WBITS, zdict=PRESET_DICTIONARY)
+
+    async def read_frame(self, reader, max_frame_bytes=None):
+        """
+        Read and decompress one frame.
+        Args:
+            reader (asyncio.StreamReader): The stream to read from.
+            max_frame_bytes (int, optional): Largest accepted decompressed frame. Unlimited when None.
+        Returns:
+            bytes or None: The JSON frame, or None if the connection closed.
+        """
+        try:
+            header = await reader.readexactly(HEADER.size)
+            body = await reader.readexactly(HEADER.unpack(header)[0])
+        except EOFError:
+            return None
+        limit = max_frame_bytes or 0
+        data = self._context.decompress(body + SYNC_MARKER, limit)
+        if self._context.unconsumed_tail:
+            raise ValueError(f"Frame exceeds {max_frame_bytes} bytes")
+        return data
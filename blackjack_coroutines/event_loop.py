@@ -0,0 +1,59 @@
+import asyncio
+import os
+
+# 'auto' picks uvloop when it is installed and the default asyncio loop otherwise
+BACKENDS = ('auto', 'asyncio', 'uvloop')
+
+
+def available_backends():
+    """
+    List the event loop backends that can run in this environment.
+    Returns:
+        list[str]: 'asyncio', plus 'uvloop' when it is installed.
+    """
+    backends = ['asyncio']
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return backends
+    backends.append('uvloop')
+    return backends
+
+
+def resolve_backend(backend=None):
+    """
+    Decide which loop backend to use.
+    Args:
+        backend (str, optional): 'auto', 'asyncio' or 'uvloop'. Defaults to BLACKJACK_LOOP or 'auto'.
+    Returns:
+        str: 'asyncio' or 'uvloop'. An explicit 'uvloop' falls back to 'asyncio' if it is missing.
+    """
+    backend = (backend or os.environ.get('BLACKJACK_LOOP') or 'auto').lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown event loop backend {backend!r}. Choose from {', '.join(BACKENDS)}.")
+    if backend == 'asyncio':
+        return 'asyncio'
+    if 'uvloop' in available_backends():
+        return 'uvloop'
+    if backend == 'uvloop':
+        print("[Loop] uvloop is not installed, falling back to asyncio.")
+    return 'asyncio'
+
+
+def run(coroutine, backend=None):
+    """
+    Run a coroutine to completion on the selected event loop, like asyncio.run().
+    Args:
+        coroutine (coroutine): The entry point to run.
+        backend (str, optional): See resolve_backend.
+    Returns:
+        The coroutine's result.
+    """
+    if resolve_backend(backend) == 'asyncio':
+        return asyncio.run(coroutine)
+    import uvloop
+    if hasattr(asyncio, 'Runner'):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coroutine)
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(coroutine)
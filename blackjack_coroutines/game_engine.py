@@ -1,37 +1,56 @@
-import asyncio
 from player import Player, Dealer
-from blackjack_rules import *
+from blackjack_rules import DEFAULT_RULES, is_blackjack, is_bust, determine_winners
 from card import Deck
+import asyncio
+import os
+from console import async_input
+from metrics import metrics
 
-async def async_input(prompt: str) -> str:
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, input, prompt)
-
-def check_natural_blackjacks(players: list[Player], dealer: Dealer):
+def check_natural_blackjacks(players: list[Player], dealer: Dealer, rules=DEFAULT_RULES):
     """
-    Check if any player or the dealer has a natural blackjack (21 with two cards).
-    - If a player has a blackjack, they win immediately.
+    Check if any player or the dealer has a natural blackjack (21 with two cards) and settle those hands.
+    - If a player has a blackjack, they win immediately (or push against a dealer blackjack).
+    - If the dealer has a blackjack, every other player loses immediately.
+    - Settled players are marked to stand so they take no further turn.
+    - Returns (settled, dealer_has_blackjack), where settled maps each settled player to its
+      (player, result, payout) settlement.
     """
     dealer_has_blackjack = is_blackjack(dealer.hand)
+    settled = {}
     
     for player in players:
         if is_blackjack(player.hand):
             if dealer_has_blackjack:
                 # Push - return bet
-                payout = calculate_payout(player.current_bet, 'push')
-                player.chips += payout
+                result = 'push'
+                payout = rules.calculate_payout(player.current_bet, result)
                 print(f"{player.name} has blackjack, but dealer also has blackjack. Push!")
             else:
                 # Player blackjack wins
-                payout = calculate_payout(player.current_bet, 'blackjack')
-                player.chips += payout
+                result = 'blackjack'
+                payout = rules.calculate_payout(player.current_bet, result)
                 print(f"{player.name} has a natural blackjack! Wins {payout} chips!")
         elif dealer_has_blackjack:
             # Dealer blackjack, player loses (bet already deducted)
+            result, payout = 'lose', 0
             print(f"{player.name} loses to dealer's blackjack.")
+        else:
+            continue
+        player.collect_payout(payout)
+        player.mustStand = True
+        settled[player] = (player, result, payout)
     
     if dealer_has_blackjack:
         print("Dealer has a natural blackjack!")
+    return settled, dealer_has_blackjack
+
+def has_live_hands(players: list[Player], settled=None):
+    """
+    Check whether any unsettled player still has a hand the dealer needs to play against.
+    - The dealer does not draw when every open hand is bust.
+    """
+    settled = settled or {}
+    return any(player not in settled and not is_bust(player.hand) for player in players)
 
 async def initial_deal(deck: Deck, players: list[Player], dealer: Dealer):
     """
@@ -55,11 +74,48 @@ async def initial_deal(deck: Deck, players: list[Player], dealer: Dealer):
     # Dealer gets one card face down (not shown to players)
     await dealer.add_hidden_card(deck.deal_card())
 
-def create_players(player_names: list[str]):
+# Seats at one table
+MAX_PLAYERS = 3
+
+def open_ledger_from_env():
+    """
+    Open the chip ledger named by BLACKJACK_LEDGER, if set.
+    - SQLite is only imported when persistence is enabled.
+    """
+    if not os.environ.get('BLACKJACK_LEDGER'):
+        return None
+    from ledger import ChipLedger
+    return ChipLedger.from_env()
+
+def open_round_store_from_env():
+    """
+    Open the columnar round store in the BLACKJACK_ROUND_STORE directory, if set.
+    - mmap and the store module are only loaded when recording is enabled.
+    """
+    directory = os.environ.get('BLACKJACK_ROUND_STORE')
+    if not directory:
+        return None
+    from round_store import RoundStoreWriter
+    return RoundStoreWriter(directory)
+
+def attach_round_store(engine, round_store):
+    """
+    Record every hand the engine settles in round_store, if there is one.
+    - Rows are published after each round, so a crash loses at most the round in progress.
+    """
+    if round_store is None:
+        return
+    def record(engine, settlements):
+        round_store.record_round(engine, settlements)
+        round_store.flush()
+    engine.round_listeners.append(record)
+
+def create_players(player_names: list[str], ledger=None):
     """
     Create player instances from a list of names.
     - Receives a list of player names.
-    - Initializes each player with a default chip count of 1000.
+    - Initializes each player with a default chip count of 1000,
+      or their last balance when a chip ledger is given.
     - Returns a list of Player instances.
     """
 
@@ -70,11 +126,14 @@ def create_players(player_names: list[str]):
     if len(player_names) < 1:
         print("At least one player is required to start the game.")
         return []
-    elif len(player_names) > 3:
-        print("Maximum of 3 players allowed. Truncating to first 3 names.")
-        player_names = player_names[:3]
+    elif len(player_names) > MAX_PLAYERS:
+        print(f"Maximum of {MAX_PLAYERS} players allowed. Truncating to first {MAX_PLAYERS} names.")
+        player_names = player_names[:MAX_PLAYERS]
     
-    players = [Player(name) for name in player_names]
+    if ledger is None:
+        players = [Player(name) for name in player_names]
+    else:
+        players = [Player(name, ledger.balance(name), ledger) for name in player_names]
     print(f"Players created: {[player.name for player in players]}")
     return players
 
@@ -133,12 +192,15 @@ async def get_player_action(player: Player, valid_actions: list[str], player_inp
             
             
             
-async def player_turn(player: Player, dealer: Dealer, deck: Deck, player_input_strategy=None):
+async def player_turn(player: Player, dealer: Dealer, deck: Deck, player_input_strategy=None, rules=DEFAULT_RULES):
     """
     Handle the player's turn by allowing them to hit, stand, or double down.
     - Continues until the player stands or goes bust.
     """
-    valid_actions = get_valid_actions(player.hand, dealer.hand)
+    valid_actions = rules.get_valid_actions(player.hand, dealer.hand)
+    if 'double' in valid_actions and player.chips < player.current_bet:
+        # A double the player cannot cover would be refused and asked for again forever
+        valid_actions.remove('double')
     while not player.mustStand:
         action = await get_player_action(player, valid_actions, player_input_strategy)
         
@@ -158,43 +220,55 @@ async def player_turn(player: Player, dealer: Dealer, deck: Deck, player_input_s
                 
 async def dealer_turn(dealer: Dealer, deck: Deck):
     """
-    Handle the dealer's turn based on standard Blackjack rules.
-    - Dealer hits until their hand value is 17 or higher.
+    Handle the dealer's turn based on the table's rule set.
+    - Dealer hits until their hand value reaches 17 (or 18, depending on the S17/H17/A17 rule).
     """
     while dealer.should_hit():
         await dealer.handle_hit(deck)
         print(f"Dealer hits: {dealer.show_hand()}")
     print(f"Dealer stands with hand: {dealer.show_hand()}")
     
-def payout_winner(players: list[Player], dealer: Dealer):
+def payout_winner(players: list[Player], dealer: Dealer, rules=DEFAULT_RULES, settled=None):
     """
     Determine the winner of the round and payout accordingly.
     - Compares each player's hand against the dealer's hand.
     - Updates player chips based on the game result.
+    - Players in settled (from check_natural_blackjacks) were already paid and are passed through.
+    - Returns a list of (player, result, payout) settlements in seat order.
     """
-    results = determine_winners([player.hand for player in players], players, dealer.hand)
+    settled = settled or {}
+    open_players = [player for player in players if player not in settled]
+    results = dict(zip(open_players, determine_winners([player.hand for player in open_players], open_players, dealer.hand)))
+    settlements = []
     
-    for player, result in zip(players, results):
+    for player in players:
+        if player in settled:
+            settlements.append(settled[player])
+            continue
+        result = results[player]
         # Calculate payout based on result
-        payout = calculate_payout(player.current_bet, result)
+        payout = rules.calculate_payout(player.current_bet, result)
         
         # Debug - print detailed payout info
         print(f"DEBUG: {player.name} bet {player.current_bet}, result: {result}, payout: {payout}")
         
         # Add payout to player chips
-        player.chips += payout
+        player.collect_payout(payout)
         
         # Print appropriate message based on result
         if result == 'win':
             print(f"{player.name} wins! Receives {payout} chips.")
         elif result == 'blackjack':
-            print(f"{player.name} has blackjack! Receives {payout} chips (2.5x bet).")
+            print(f"{player.name} has blackjack! Receives {payout} chips ({rules.payout_multipliers['blackjack']:g}x bet).")
         elif result == 'push':
             print(f"{player.name} pushes. Receives {payout} chips back.")
         elif result == 'lose':
             print(f"{player.name} loses. No payout.")
         
         print(f"{player.name} now has {player.chips} chips.")
+        settlements.append((player, result, payout))
+
+    return settlements
 
 def reset_for_new_round(players: list[Player], dealer: Dealer):
     """
@@ -206,45 +280,78 @@ def reset_for_new_round(players: list[Player], dealer: Dealer):
     print("All hands reset for new round.")
 
 class GameEngine:
-    def __init__(self):
+    def __init__(self, table_id="local", ledger=None, rules=DEFAULT_RULES):
         # Initialize the game engine with necessary components
+        self.table_id = table_id
+        self.ledger = ledger
+        self.rules = rules
         self.players: list[Player] = []
-        self.dealer = Dealer()
-        self.deck = Deck()
+        self.dealer = Dealer(rules)
+        self.deck = Deck(rules.decks)
         self.current_round = 0
+        self.phase = 'idle'
+        # Players restored from a snapshot, waiting for their client to reconnect
+        self.reserved_seats: dict[str, Player] = {}
+        # Callables run as listener(engine, settlements) after each round is settled
+        self.round_listeners = []
         
     async def play_round(self, player_input_strategy=None):
         """
         Plays a single round of Blackjack, using the provided input strategy for player input.
         """
+        profiler = metrics.start_profile(self.table_id)
+        try:
+            with metrics.timer('round.total'):
+                await self._play_round_phases(player_input_strategy)
+        finally:
+            metrics.stop_profile(self.table_id, profiler)
+        metrics.increment('rounds')
+
+    async def _play_round_phases(self, player_input_strategy):
         # Betting phase - each player places their bet
-        await collect_bets(self.players, player_input_strategy)
-        
-        # Deal initial cards to players and dealer
-        await initial_deal(self.deck, self.players, self.dealer)
-        print("Initial cards dealt.")
+        with metrics.timer('round.betting'):
+            await collect_bets(self.players, player_input_strategy)
         
-        # Display initial game state
-        display_game_state(self.players, self.dealer, hide_dealer_card=True)
-        
-        # Check for natural blackjacks
-        check_natural_blackjacks(self.players, self.dealer)
+        with metrics.timer('round.dealing'):
+            # Deal initial cards to players and dealer
+            await initial_deal(self.deck, self.players, self.dealer)
+            print("Initial cards dealt.")
+            
+            # Display initial game state
+            display_game_state(self.players, self.dealer, hide_dealer_card=True)
+            
+            # Settle naturals once, up front
+            settled, dealer_has_blackjack = check_natural_blackjacks(self.players, self.dealer, self.rules)
         
         # Set up for player turns
         self.current_round += 1
         print(f"Round {self.current_round} begins!")
         
-        for player in self.players:
-            await player_turn(player, self.dealer, self.deck, player_input_strategy)
+        # A dealer blackjack settles every hand, so the round ends here
+        if not dealer_has_blackjack:
+            with metrics.timer('round.player_action'):
+                for player in self.players:
+                    if player not in settled:
+                        await player_turn(player, self.dealer, self.deck, player_input_strategy, self.rules)
 
-        await dealer_turn(self.dealer, self.deck)
-        payout_winner(self.players, self.dealer)
-        
-        # If any player has no chips left, add 100 chips to keep them in the game
-        for player in self.players:
-            player.zero_chips()
+            with metrics.timer('round.dealer'):
+                if has_live_hands(self.players, settled):
+                    await dealer_turn(self.dealer, self.deck)
 
-    async def start_game(self, player_names: list[str], player_input_strategy=None):
+        with metrics.timer('round.results'):
+            settlements = payout_winner(self.players, self.dealer, self.rules, settled)
+            for listener in self.round_listeners:
+                listener(self, settlements)
+            
+            # If any player has no chips left, add 100 chips to keep them in the game
+            for player in self.players:
+                player.zero_chips()
+
+    async def start_game(self, player_names: list[str], player_input_strategy=None, continuous=False, round_gap=0.0):
+        """
+        Create the players and play rounds until the host stops.
+        - In continuous mode rounds run back-to-back, round_gap seconds apart, without asking the host.
+        """
         print("Starting the Blackjack game...")
         
         if not player_names:
@@ -256,7 +363,7 @@ class GameEngine:
         print("Deck shuffled.")
 
         # Create players using the dedicated method
-        self.players = create_players(player_names)
+        self.players = create_players(player_names, self.ledger)
         while True:
             if not self.players:
                 print("No players available. Exiting game.")
@@ -264,6 +371,11 @@ class GameEngine:
             
             # Play a round
             await self.play_round(player_input_strategy)
+
+            if continuous:
+                reset_for_new_round(self.players, self.dealer)
+                await asyncio.sleep(round_gap)
+                continue
             
             # Ask if players want to continue
             continue_game = (await async_input("Do you want to play another round? (yes/no): ")).strip().lower()
@@ -272,4 +384,21 @@ class GameEngine:
                 break
             
             # Reset for the next round
-            reset_for_new_round(self.players, self.dealer)
\ No newline at end of file
+            reset_for_new_round(self.players, self.dealer)
+
+async def start_local_game():
+    """
+    Start the blackjack game in local (terminal) mode.
+    """
+    engine = GameEngine(ledger=open_ledger_from_env())
+    round_store = open_round_store_from_env()
+    attach_round_store(engine, round_store)
+    player_names = (await async_input("Enter player names (comma separated): ")).split(',')
+    player_names = [name.strip() for name in player_names if name.strip()]
+    try:
+        await engine.start_game(player_names)
+    finally:
+        if engine.ledger is not None:
+            engine.ledger.close()
+        if round_store is not None:
+            round_store.close()
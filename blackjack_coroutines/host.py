@@ -0,0 +1,572 @@
+import asyncio
+import itertools
+import os
+import signal
+import time
+from console import async_input
+from game_engine import MAX_PLAYERS, GameEngine, attach_round_store, check_natural_blackjacks, create_players, has_live_hands, open_ledger_from_env, open_round_store_from_env, initial_deal, dealer_turn, payout_winner, reset_for_new_round
+from network import DISCONNECTED, TIMED_OUT, AsyncServer
+from blackjack_rules import is_bust
+from matchmaking import Matchmaker, balance_priority
+from metrics import metrics
+
+async def networked_bet_input(server, player_name):
+    """Send a bet request to the client and wait for response."""
+    client_writer = None
+    for writer, connected_player_name in server.clients.items():
+        if connected_player_name == player_name:
+            client_writer = writer
+            break
+    if client_writer is None:
+        raise RuntimeError(f"No connection for player {player_name}")
+    await server.send_message(client_writer, {"type": "bet_request"})
+    while True:
+        message = await server.recv_message(client_writer._transport._protocol._stream_reader)
+        if message and message.get("type") == "bet_response":
+            return message.get("amount")
+
+async def networked_action_input(server, player_name, prompt):
+    """Send an action request to the client and wait for response."""
+    client_writer = None
+    for writer, connected_player_name in server.clients.items():
+        if connected_player_name == player_name:
+            client_writer = writer
+            break
+    if client_writer is None:
+        raise RuntimeError(f"No connection for player {player_name}")
+    await server.send_message(client_writer, {"type": "action_request", "prompt": prompt})
+    while True:
+        message = await server.recv_message(client_writer._transport._protocol._stream_reader)
+        if message and message.get("type") == "action_response":
+            return message.get("action")
+
+def serialize_game_state(game_engine, game_phase, current_player=None):
+    """Serialize the game state for broadcasting to clients."""
+    # Determine if dealer cards should be hidden (only in certain phases)
+    hide_dealer_cards = game_phase in ['betting', 'player_action']
+    
+    # Special handling for dealing phase - show at least one card
+    dealer_hand_representation = ""
+    if game_phase == 'dealing' and len(game_engine.dealer.hand) >= 1:
+        dealer_hand_representation = f"{game_engine.dealer.hand[0]} | [Hidden]" if len(game_engine.dealer.hand) > 1 else str(game_engine.dealer.hand[0])
+    else:
+        dealer_hand_representation = game_engine.dealer.show_hand(hide_first=hide_dealer_cards)
+        
+    return {
+        'type': 'state',
+        'phase': game_phase,
+        'players': [player.to_state() for player in game_engine.players],
+        'dealer': {
+            'hand': dealer_hand_representation
+        },
+        'current_player': current_player,
+        'round': game_engine.current_round
+    }
+
+async def broadcast_state(server, game_engine, game_phase, current_player=None):
+    game_engine.phase = game_phase
+    encoded_state = server.encode_message(serialize_game_state(game_engine, game_phase, current_player))
+    server.publish_state(game_engine.table_id, encoded_state)
+    # Only this table's players: the server may run several tables and a queue of waiting players
+    for player in list(game_engine.players):
+        client_writer = server.find_writer(player.name)
+        if client_writer is None:
+            continue
+        try:
+            await server.send_encoded(client_writer, encoded_state)
+        except Exception as error:
+            print(f"[Server] Failed to send state: {error}")
+
+async def get_remote_bet_input(server, player_name):
+    """
+    Get bet input from a remote player.
+    - Returns None if the player is not connected, disconnects or misses the decision deadline.
+    """
+    client_writer = server.find_writer(player_name)
+    if client_writer is None:
+        return None
+    response_queue = server.get_response_queue(player_name)
+    # Drop late answers to earlier, timed-out requests
+    while not response_queue.empty():
+        response_queue.get_nowait()
+    await server.send_message(client_writer, {"type": "bet_request"})
+    requested_at = time.perf_counter()
+    deadline = server.start_decision_timer(player_name)
+    while True:
+        with metrics.timer('queue.bet_wait'):
+            message = await response_queue.get()
+        if message is DISCONNECTED or message is TIMED_OUT:
+            server.cancel_decision_timer(deadline)
+            return None
+        if message and message.get("type") == "bet_response":
+            server.cancel_decision_timer(deadline)
+            server.record_decision(time.perf_counter() - requested_at)
+            return message.get("amount")
+
+async def get_remote_action_input(server, player_name, action_prompt):
+    """
+    Get action input from a remote player.
+    - A player who is not connected, disconnects or misses the decision deadline stands.
+    """
+    client_writer = server.find_writer(player_name)
+    if client_writer is None:
+        return 'stand'
+    response_queue = server.get_response_queue(player_name)
+    # Drop late answers to earlier, timed-out requests
+    while not response_queue.empty():
+        response_queue.get_nowait()
+    await server.send_message(client_writer, {"type": "action_request", "prompt": action_prompt})
+    requested_at = time.perf_counter()
+    deadline = server.start_decision_timer(player_name)
+    while True:
+        with metrics.timer('queue.action_wait'):
+            message = await response_queue.get()
+        if message is DISCONNECTED or message is TIMED_OUT:
+            server.cancel_decision_timer(deadline)
+            return 'stand'
+        if message and message.get("type") == "action_response":
+            server.cancel_decision_timer(deadline)
+            server.record_decision(time.perf_counter() - requested_at)
+            return message.get("action")
+
+async def get_host_bet_input(prompt):
+    """Get bet input from the host."""
+    return await async_input(prompt)
+
+async def get_host_action_input(prompt):
+    """Get action input from the host."""
+    return await async_input(prompt)
+
+def create_remote_bet_input_function(server, player_name):
+    """Create a function to get bet input for a specific remote player."""
+    return lambda prompt: get_remote_bet_input(server, player_name)
+
+def create_remote_action_input_function(server, player_name):
+    """Create a function to get action input for a specific remote player."""
+    return lambda prompt: get_remote_action_input(server, player_name, prompt)
+
+def setup_input_strategies(host_name, server, player_names):
+    """Set up input strategies for bets and actions."""
+    bet_input_strategy = {}
+    action_input_strategy = {}
+
+    for player_name in player_names:
+        if player_name == host_name:
+            bet_input_strategy[player_name] = get_host_bet_input
+            action_input_strategy[player_name] = get_host_action_input
+        else:
+            bet_input_strategy[player_name] = create_remote_bet_input_function(server, player_name)
+            action_input_strategy[player_name] = create_remote_action_input_function(server, player_name)
+
+    return bet_input_strategy, action_input_strategy
+
+async def play_game_round(game_engine, server, bet_input_strategy, action_input_strategy):
+    """Play a single round of the game."""
+    profiler = metrics.start_profile(game_engine.table_id)
+    try:
+        with metrics.timer('round.total'):
+            await play_game_round_phases(game_engine, server, bet_input_strategy, action_input_strategy)
+    finally:
+        metrics.stop_profile(game_engine.table_id, profiler)
+    server.record_round()
+    metrics.increment('rounds')
+
+async def play_game_round_phases(game_engine, server, bet_input_strategy, action_input_strategy):
+    """Run the betting, dealing, player action, dealer and results phases of a round."""
+    game_engine.current_round += 1
+    print(f"\nStarting round {game_engine.current_round}")
+
+    # Betting phase
+    with metrics.timer('round.betting'):
+        await broadcast_state(server, game_engine, 'betting')
+        # Only players who bet are dealt in, asked to act and settled
+        betting = []
+        for player in game_engine.players:
+            player.zero_chips()
+
+            while True:
+                bet = await bet_input_strategy[player.name](f"{player.name}, place your bet (1-{player.chips}): ")
+                if bet is None:
+                    # Disconnected or timed-out players sit this round out with no chips at stake
+                    print(f"{player.name} is away and sits out this round.")
+                    break
+                try:
+                    if player.place_bet(int(bet)):
+                        betting.append(player)
+                        break
+                except ValueError:
+                    print(f"Invalid bet from {player.name}. Please enter a number.")
+
+            await broadcast_state(server, game_engine, 'betting', current_player=player.name)
+
+    # Dealing phase
+    with metrics.timer('round.dealing'):
+        game_engine.deck.reset()  # Completely reset the deck with fresh cards
+        await initial_deal(game_engine.deck, betting, game_engine.dealer)
+        # Settle naturals once, up front
+        settled, dealer_has_blackjack = check_natural_blackjacks(betting, game_engine.dealer, game_engine.rules)
+        await broadcast_state(server, game_engine, 'dealing')
+
+    # A dealer blackjack settles every hand, so nobody acts and the dealer does not draw
+    if not dealer_has_blackjack:
+        # Player actions
+        with metrics.timer('round.player_action'):
+            for player in betting:
+                if player in settled:
+                    continue
+                while not player.mustStand:
+                    await broadcast_state(server, game_engine, 'player_action', current_player=player.name)
+                    # Doubling is offered when the table's rule set allows it for this hand
+                    valid_actions = game_engine.rules.get_valid_actions(player.hand, game_engine.dealer.hand)
+                    if 'double' in valid_actions and player.chips < player.current_bet:
+                        valid_actions.remove('double')
+                    action_prompt = f"{player.name}, choose your action ({', '.join(valid_actions)}): "
+                    action = await action_input_strategy[player.name](action_prompt)
+                    if action == 'hit':
+                        await player.handle_hit(game_engine.deck)
+                        if is_bust(player.hand):
+                            player.mustStand = True
+                    elif action == 'stand':
+                        player.handle_stand()
+                        break
+                    elif action == 'double' and 'double' in valid_actions:
+                        await player.handle_double_down(game_engine.deck)
+
+        # Dealer turn
+        with metrics.timer('round.dealer'):
+            if has_live_hands(betting, settled):
+                await dealer_turn(game_engine.dealer, game_engine.deck)
+            await broadcast_state(server, game_engine, 'dealer')
+
+    # Payout/results
+    with metrics.timer('round.results'):
+        settlements = payout_winner(betting, game_engine.dealer, game_engine.rules, settled)
+        for listener in game_engine.round_listeners:
+            listener(game_engine, settlements)
+
+        # Handle zero chips
+        for player in game_engine.players:
+            player.zero_chips()
+
+        await broadcast_state(server, game_engine, 'results')
+
+def sync_seats(game_engine, server, host_name, bet_input_strategy, action_input_strategy, matchmaker):
+    """
+    Between rounds, drop players who disconnected and fill free seats from the matchmaking queue.
+    Returns the names of newly seated players.
+    """
+    connected = set(server.clients.values())
+    for player in list(game_engine.players):
+        if player.name != host_name and player.name not in connected:
+            game_engine.players.remove(player)
+            bet_input_strategy.pop(player.name, None)
+            action_input_strategy.pop(player.name, None)
+            print(f"[Host] {player.name} left the table.")
+
+    new_names = matchmaker.take(MAX_PLAYERS - len(game_engine.players))
+    if new_names:
+        for name in new_names:
+            # Players restored from a snapshot get their seat (and chips) back
+            player = game_engine.reserved_seats.pop(name, None)
+            game_engine.players.append(player if player is not None else create_players([name], game_engine.ledger)[0])
+        new_bet_inputs, new_action_inputs = setup_input_strategies(host_name, server, new_names)
+        bet_input_strategy.update(new_bet_inputs)
+        action_input_strategy.update(new_action_inputs)
+        print(f"[Host] {', '.join(new_names)} joined the table.")
+    return new_names
+
+async def send_start(server, player_names):
+    """Send the start message to the given players so their clients leave the lobby."""
+    for client_writer, name in list(server.clients.items()):
+        if name not in player_names:
+            continue
+        try:
+            await server.send_message(client_writer, {"type": "start"})
+        except Exception as error:
+            print(f"[Server] Failed to send start message: {error}")
+
+async def start_multiplayer_game(host_name, server, continuous=False, round_gap=2.0, game_engine=None, matchmaker=None):
+    """
+    Start the multiplayer game with the given host and server.
+    - host_name may be None for an unattended table with no host seat.
+    - game_engine may be a table prepared by the caller (restored from a snapshot, or seated
+      by the lobby); the caller then owns its ledger and round store.
+    - Joined players wait in matchmaker's queue and take seats as they open between rounds.
+      A queue for this table alone is created when matchmaker is None.
+    - In continuous mode rounds run back-to-back, round_gap seconds apart, without asking the
+      host.
+    """
+    owns_ledger = game_engine is None
+    round_store = None
+    if owns_ledger:
+        game_engine = GameEngine(ledger=open_ledger_from_env())
+        game_engine.deck.shuffle()
+        game_engine.current_round = 0
+        round_store = open_round_store_from_env()
+        attach_round_store(game_engine, round_store)
+    owns_matchmaker = matchmaker is None
+    if owns_matchmaker:
+        # Restored players are seated ahead of anyone else waiting
+        matchmaker = Matchmaker(server, priority_of=lambda name: int(name in game_engine.reserved_seats))
+    if owns_ledger:
+        seats = MAX_PLAYERS - (1 if host_name else 0)
+        game_engine.players = create_players(([host_name] if host_name else []) + matchmaker.take(seats), game_engine.ledger)
+    player_names = [player.name for player in game_engine.players]
+    print(f"[Host] Starting multiplayer game with players: {player_names}")
+
+    # Send start message to seated clients to transition them from lobby to game
+    await send_start(server, player_names)
+
+    # Set up input strategies
+    bet_input_strategy, action_input_strategy = setup_input_strategies(host_name, server, player_names)
+    server.register_table(game_engine)
+
+    # Game loop
+    try:
+        while True:
+            new_names = sync_seats(game_engine, server, host_name, bet_input_strategy, action_input_strategy, matchmaker)
+            await send_start(server, new_names)
+            if continuous and not game_engine.players:
+                await asyncio.sleep(round_gap)
+                continue
+
+            await play_game_round(game_engine, server, bet_input_strategy, action_input_strategy)
+
+            if continuous:
+                reset_for_new_round(game_engine.players, game_engine.dealer)
+                game_engine.phase = 'idle'
+                await asyncio.sleep(round_gap)
+                continue
+
+            # Ask to continue
+            while True:
+                continue_game = (await async_input("Do you want to play another round? (yes/no): ")).strip().lower()
+                if continue_game in ('yes', 'no'):
+                    break
+                print("Invalid input, type 'yes' or 'no'.")
+            if continue_game == 'no':
+                break
+            # Reset for new round
+            reset_for_new_round(game_engine.players, game_engine.dealer)
+            game_engine.phase = 'idle'
+    finally:
+        server.unregister_table(game_engine)
+        if owns_matchmaker:
+            matchmaker.close()
+        if owns_ledger and game_engine.ledger is not None:
+            game_engine.ledger.close()
+        if round_store is not None:
+            round_store.close()
+    print("[Host] Multiplayer game finished.")
+
+def server_options_from_env(decision_timeout=None):
+    """
+    Read AsyncServer options from the environment.
+    - BLACKJACK_STATS_PORT enables the stats endpoint.
+    - BLACKJACK_DECISION_TIMEOUT and BLACKJACK_IDLE_TIMEOUT set deadlines in seconds.
+    - BLACKJACK_COMPRESSION=1 lets clients negotiate compressed frames.
+    - BLACKJACK_MAX_SESSIONS lets one connection multiplex that many player sessions.
+    """
+    stats_port = os.environ.get('BLACKJACK_STATS_PORT')
+    decision = os.environ.get('BLACKJACK_DECISION_TIMEOUT')
+    idle = os.environ.get('BLACKJACK_IDLE_TIMEOUT')
+    return {
+        'stats_port': int(stats_port) if stats_port else None,
+        'decision_timeout': float(decision) if decision else decision_timeout,
+        'idle_timeout': float(idle) if idle else None,
+        'compression': os.environ.get('BLACKJACK_COMPRESSION') == '1',
+        'max_sessions': int(os.environ.get('BLACKJACK_MAX_SESSIONS', 0)),
+    }
+
+async def initialize_host_game():
+    """
+    This function initializes the host game function by receiving the host's name and starting the server.
+    """
+    host_name = await async_input("Enter your name (host): ")
+    server = AsyncServer(**server_options_from_env())
+    player_names = [host_name.strip()] 
+    print("[Host] Starting server... Waiting for players to join.")
+
+    # Start server in background
+    server_task = asyncio.create_task(server.start())
+
+    return host_name, server, player_names, server_task
+
+async def host_game():
+    """
+    Host game logic: prompt for name, start server, accept clients, collect names, allow host to type 'start' to begin.
+    """
+    host_name, server, player_names, server_task = await initialize_host_game()
+
+    # Simple lobby loop: print connected players, allow 'start' to begin
+    try:
+        while True:
+            print(f"\nCurrent players: {player_names + list(server.clients.values())}")
+            command = await async_input("Type 'start' to begin or press Enter to refresh: ")
+            if command.strip().lower() == 'start':
+                print("[Host] Starting game...")
+                await start_multiplayer_game(host_name, server)
+                break
+    finally:
+        # If the server exists, close it
+        if server.server is not None:
+            server.server.close()
+            await server.server.wait_closed()
+        
+        # If the server task is running, cancel it
+        server_task.cancel()
+
+async def save_snapshots(path, server, interval):
+    """Write a snapshot of every registered table every interval seconds."""
+    from snapshot import save_snapshot
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            save_snapshot(path, list(server.tables.values()))
+        except OSError as error:
+            print(f"[Server] Failed to write snapshot: {error}")
+
+async def serve_table():
+    """
+    Run an unattended table: start the server and deal continuously to whoever joins.
+    - BLACKJACK_PORT sets the port (default 8765), BLACKJACK_ROUND_GAP the pause between rounds.
+    - BLACKJACK_SNAPSHOT names a snapshot file: the table is restored from it on start and
+      saved to it every BLACKJACK_SNAPSHOT_INTERVAL seconds (default 10) and on shutdown.
+    """
+    # Nobody watches an unattended table, so a silent player must not stall it
+    server = AsyncServer(
+        port=int(os.environ.get('BLACKJACK_PORT', 8765)),
+        **server_options_from_env(decision_timeout=30.0),
+    )
+    round_gap = float(os.environ.get('BLACKJACK_ROUND_GAP', 2.0))
+    snapshot_path = os.environ.get('BLACKJACK_SNAPSHOT')
+    game_engine = None
+    snapshot_task = None
+    round_store = None
+    if snapshot_path:
+        from snapshot import load_snapshot
+        # One ledger, and so one writer thread, whether or not a snapshot is restored
+        ledger = open_ledger_from_env()
+        restored = load_snapshot(snapshot_path, ledger=ledger)
+        if restored:
+            game_engine = restored[0]
+            print(f"[Host] Restored table at round {game_engine.current_round}, holding seats for: "
+                  f"{', '.join(game_engine.reserved_seats) or 'nobody'}")
+        else:
+            game_engine = GameEngine(ledger=ledger)
+        round_store = open_round_store_from_env()
+        attach_round_store(game_engine, round_store)
+        interval = float(os.environ.get('BLACKJACK_SNAPSHOT_INTERVAL', 10.0))
+        snapshot_task = asyncio.create_task(save_snapshots(snapshot_path, server, interval))
+
+    server_task = asyncio.create_task(server.start())
+    game_task = asyncio.create_task(
+        start_multiplayer_game(None, server, continuous=True, round_gap=round_gap, game_engine=game_engine)
+    )
+    # Stop cleanly on SIGTERM too, so a supervised restart still writes the final snapshot
+    terminated = []
+    def on_sigterm():
+        terminated.append(True)
+        game_task.cancel()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, on_sigterm)
+    except NotImplementedError:
+        # Windows event loops have no signal handlers
+        pass
+    print(f"[Host] Dealing continuously every {round_gap}s. Press Ctrl+C to stop.")
+    try:
+        await game_task
+    except asyncio.CancelledError:
+        if not terminated:
+            raise
+        print("[Host] Received SIGTERM, shutting down.")
+    finally:
+        game_task.cancel()
+        if snapshot_task is not None:
+            snapshot_task.cancel()
+            from snapshot import save_snapshot
+            size = save_snapshot(snapshot_path, [game_engine])
+            print(f"[Host] Saved table snapshot to {snapshot_path} ({size} bytes).")
+            if ledger is not None:
+                ledger.close()
+            if round_store is not None:
+                round_store.close()
+        if server.server is not None:
+            server.server.close()
+            await server.server.wait_closed()
+        server_task.cancel()
+
+# Seconds between the lobby's checks for tables to open
+LOBBY_TICK = 0.5
+
+async def serve_lobby():
+    """
+    Run a matchmaking lobby: queue joining players and open continuous tables for them in batches.
+    - Open tables fill free seats from the queue between rounds.
+    - A new table opens when a full table's worth of players is waiting beyond those free seats,
+      or when someone has waited BLACKJACK_MAX_WAIT seconds (default 10).
+    - BLACKJACK_TABLES caps the number of tables (default 10), and BLACKJACK_PRIORITY_BOOST sets
+      the seconds of waiting one priority level is worth (default 30).
+    - With a chip ledger, players are prioritised by balance, one level per
+      BLACKJACK_PRIORITY_CHIPS chips (default 1000); without one everyone waits in join order.
+    """
+    server = AsyncServer(
+        port=int(os.environ.get('BLACKJACK_PORT', 8765)),
+        **server_options_from_env(decision_timeout=30.0),
+    )
+    round_gap = float(os.environ.get('BLACKJACK_ROUND_GAP', 2.0))
+    max_tables = int(os.environ.get('BLACKJACK_TABLES', 10))
+    max_wait = float(os.environ.get('BLACKJACK_MAX_WAIT', 10.0))
+    ledger = open_ledger_from_env()
+    round_store = open_round_store_from_env()
+    priority_of = None
+    if ledger is not None:
+        priority_of = balance_priority(ledger, int(os.environ.get('BLACKJACK_PRIORITY_CHIPS', 1000)))
+    matchmaker = Matchmaker(
+        server, priority_of=priority_of, priority_boost=float(os.environ.get('BLACKJACK_PRIORITY_BOOST', 30.0))
+    )
+    tables = {}  # {table_id: asyncio.Task running that table}
+    table_numbers = itertools.count(1)
+    server_task = asyncio.create_task(server.start())
+    print(f"[Host] Matchmaking lobby open for up to {max_tables} tables. Press Ctrl+C to stop.")
+    try:
+        while True:
+            await asyncio.sleep(LOBBY_TICK)
+            for table_id, task in list(tables.items()):
+                if task.done():
+                    del tables[table_id]
+                    if not task.cancelled() and task.exception() is not None:
+                        print(f"[Host] {table_id} stopped: {task.exception()}")
+            free_seats = sum(
+                MAX_PLAYERS - len(server.tables[table_id].players) for table_id in tables if table_id in server.tables
+            )
+            waiting = matchmaker.waiting()
+            overflow = len(waiting) - free_seats
+            longest_wait = max((wait for _, wait in waiting), default=0.0)
+            while len(tables) < max_tables and (overflow >= MAX_PLAYERS or (overflow > 0 and longest_wait >= max_wait)):
+                batch = matchmaker.take(MAX_PLAYERS)
+                if not batch:
+                    break
+                table_id = f"table-{next(table_numbers)}"
+                game_engine = GameEngine(table_id=table_id, ledger=ledger)
+                attach_round_store(game_engine, round_store)
+                game_engine.deck.shuffle()
+                game_engine.players = create_players(batch, ledger)
+                tables[table_id] = asyncio.create_task(start_multiplayer_game(
+                    None, server, continuous=True, round_gap=round_gap, game_engine=game_engine, matchmaker=matchmaker
+                ))
+                print(f"[Host] Opened {table_id} for {', '.join(batch)}.")
+                overflow -= len(batch)
+    finally:
+        for task in tables.values():
+            task.cancel()
+        await asyncio.gather(*tables.values(), return_exceptions=True)
+        matchmaker.close()
+        if ledger is not None:
+            ledger.close()
+        if round_store is not None:
+            round_store.close()
+        if server.server is not None:
+            server.server.close()
+            await server.server.wait_closed()
+        server_task.cancel()
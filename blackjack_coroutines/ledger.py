@@ -0,0 +1,237 @@
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    player TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    balance INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS balances (
+    player TEXT PRIMARY KEY,
+    chips INTEGER NOT NULL
+);
+"""
+
+
+class ChipLedger:
+    # Backoff between attempts to commit a batch that failed, doubling up to the maximum
+    RETRY_DELAY = 0.05
+    MAX_RETRY_DELAY = 5.0
+
+    def __init__(self, path, max_latency=0.25, max_batch=1000, close_retries=5):
+        """
+        Initialize a write-behind chip ledger backed by a SQLite file.
+        Game code calls record() from the event loop, which only appends to an in-memory
+        buffer; a background thread writes the buffer in batched transactions.
+        Args:
+            path (str): The SQLite database file.
+            max_latency (float, optional): Longest time, in seconds, an entry waits in memory
+                before it is committed. Bounds what a crash can lose. Defaults to 0.25.
+            max_batch (int, optional): Flush early once this many entries are buffered. Defaults to 1000.
+            close_retries (int, optional): Attempts close() makes to commit what is left before
+                giving up. While open, failed batches are retried indefinitely. Defaults to 5.
+        """
+        self.path = path
+        self.max_latency = max_latency
+        self.max_batch = max_batch
+        self.close_retries = close_retries
+        self.last_error = None
+        self.errors = 0  # failed batch commits so far
+        self._failures = 0  # consecutive failed commits
+        self.balances = {}  # {player: chips}, kept current by record()
+        self._buffer = []
+        self._oldest = 0.0
+        self._recorded = 0
+        self._written = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        connection = self._connect()
+        try:
+            self.balances = dict(connection.execute("SELECT player, chips FROM balances"))
+        finally:
+            connection.close()
+
+        self._thread = threading.Thread(target=self._run, name="chip-ledger", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Open the ledger named by BLACKJACK_LEDGER, if set.
+        Returns:
+            ChipLedger or None: The ledger, or None when persistence is disabled.
+        """
+        path = os.environ.get('BLACKJACK_LEDGER')
+        if not path:
+            return None
+        return cls(path, max_latency=float(os.environ.get('BLACKJACK_LEDGER_LATENCY', 0.25)))
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        # WAL keeps readers unblocked and makes each batch commit atomic on crash
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def balance(self, player, default=1000):
+        """
+        Return a player's last recorded chip balance.
+        Args:
+            player (str): The player's name.
+            default (int, optional): Balance for players the ledger has never seen. Defaults to 1000.
+        Returns:
+            int: The chip balance.
+        """
+        return self.balances.get(player, default)
+
+    def record(self, player, kind, amount, balance):
+        """
+        Buffer a chip movement. Never blocks on disk.
+        Args:
+            player (str): The player's name.
+            kind (str): 'bet', 'double', 'payout' or 'top_up'.
+            amount (int): Chips added (positive) or removed (negative).
+            balance (int): The player's chips after the movement.
+        Returns:
+            None
+        """
+        self.balances[player] = balance
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Ledger is closed")
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer.append((time.time(), player, kind, amount, balance))
+            self._recorded += 1
+            if len(self._buffer) == 1 or len(self._buffer) >= self.max_batch:
+                self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Block until everything recorded so far is committed.
+        Args:
+            timeout (float, optional): Maximum seconds to wait. Waits forever when None.
+        Returns:
+            bool: True if the entries were committed in time.
+        Raises:
+            RuntimeError: If a commit fails while waiting. The entries stay buffered and are retried.
+        """
+        with self._condition:
+            target = self._recorded
+            errors = self.errors
+            self._oldest = 0.0  # makes the writer's deadline already due
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: self._written >= target or self.errors > errors, timeout)
+            if self._written >= target:
+                return True
+            if self.errors > errors:
+                raise RuntimeError(f"Ledger write failed: {self.last_error}") from self.last_error
+            return False
+
+    def close(self):
+        """
+        Commit any buffered entries and stop the writer thread.
+        Returns:
+            None
+        Raises:
+            RuntimeError: If entries could not be committed after close_retries attempts.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self._buffer:
+            raise RuntimeError(
+                f"Ledger closed with {len(self._buffer)} uncommitted entries: {self.last_error}"
+            ) from self.last_error
+
+    def _run(self):
+        connection = self._connect()
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._buffer or self._closed)
+                    while not self._closed and len(self._buffer) < self.max_batch:
+                        remaining = self._oldest + self.max_latency - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    batch, self._buffer = self._buffer, []
+                    done = self._closed
+                if batch:
+                    try:
+                        self._write_batch(connection, batch)
+                    except Exception as error:
+                        if self._retry_later(batch, error, done):
+                            continue
+                        return
+                with self._condition:
+                    self._failures = 0
+                    self._written += len(batch)
+                    self._condition.notify_all()
+                if done and not self._buffer:
+                    return
+        finally:
+            connection.close()
+
+    def _retry_later(self, batch, error, closing):
+        """
+        Put a batch that failed to commit back at the head of the buffer and back off.
+        Returns False once a closing ledger has used up close_retries, leaving the entries buffered.
+        """
+        with self._condition:
+            self._buffer[:0] = batch
+            self.last_error = error
+            self.errors += 1
+            self._failures += 1
+            failures = self._failures
+            self._condition.notify_all()
+        print(f"[Ledger] Failed to commit {len(batch)} entries ({error}), attempt {failures}.")
+        if closing and failures >= self.close_retries:
+            return False
+        time.sleep(min(self.RETRY_DELAY * 2 ** (failures - 1), self.MAX_RETRY_DELAY))
+        return True
+
+    def _write_batch(self, connection, batch):
+        latest = {}
+        for _, player, _, _, balance in batch:
+            latest[player] = balance
+        with connection:
+            connection.executemany(
+                "INSERT INTO entries (ts, player, kind, amount, balance) VALUES (?, ?, ?, ?, ?)", batch
+            )
+            connection.executemany(
+                "INSERT INTO balances (player, chips) VALUES (?, ?) "
+                "ON CONFLICT(player) DO UPDATE SET chips = excluded.chips",
+                latest.items(),
+            )
+
+
+def replay(path):
+    """
+    Rebuild the balances table from the entries log, e.g. after restoring a backup.
+    Args:
+        path (str): The SQLite database file.
+    Returns:
+        dict: {player: chips} as recomputed from the log.
+    """
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript(SCHEMA)
+        balances = dict(connection.execute(
+            "SELECT player, balance FROM entries WHERE id IN (SELECT MAX(id) FROM entries GROUP BY player)"
+        ))
+        with connection:
+            connection.execute("DELETE FROM balances")
+            connection.executemany("INSERT INTO balances (player, chips) VALUES (?, ?)", balances.items())
+        return balances
+    finally:
+        connection.close()
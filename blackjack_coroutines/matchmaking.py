@@ -0,0 +1,127 @@
+import heapq
+import itertools
+import time
+
+from metrics import Histogram, metrics
+
+
+def balance_priority(ledger, chips_per_level=1000):
+    """
+    Build a priority_of that ranks players by their chip ledger balance, one level per
+    chips_per_level chips, so bigger stacks are seated sooner.
+    Args:
+        ledger (ChipLedger): The ledger holding each player's last balance.
+        chips_per_level (int, optional): Chips one priority level is worth. Defaults to 1000.
+    Returns:
+        callable: priority_of(name) -> int.
+    """
+    return lambda name: ledger.balance(name) // chips_per_level
+
+
+class Matchmaker:
+    def __init__(self, server, priority_of=None, priority_boost=30.0):
+        """
+        Initialize a queue of joined players waiting for a seat.
+        Players are seated in order of join time minus priority * priority_boost seconds, so
+        each priority level is worth priority_boost seconds of waiting: higher priorities go
+        first, but a lower-priority player who has waited long enough is never starved.
+        Because every waiting player ages at the same rate the order never changes, and a
+        heap keyed on that value gives O(log n) joins and seatings.
+        Args:
+            server (AsyncServer): The server whose joining players are queued.
+            priority_of (callable, optional): priority_of(name) -> int for a joining player. Defaults to 0 for everyone.
+            priority_boost (float, optional): Seconds of waiting one priority level is worth. Defaults to 30.
+        """
+        self.server = server
+        self.priority_of = priority_of or (lambda name: 0)
+        self.priority_boost = priority_boost
+        self._heap = []   # [sort key, join order, name]
+        self._entries = {}  # {name: (joined_at, priority)}, the players still waiting
+        self._order = itertools.count()
+        self.wait_times = Histogram()
+        self.seated_by_priority: dict[int, list] = {}  # {priority: [players seated, total wait]}
+        server.join_listeners.append(self.enqueue)
+        server.matchmaker = self
+        for name in list(server.clients.values()):
+            self.enqueue(name)
+
+    def close(self):
+        """Stop queueing players who join the server."""
+        if self.enqueue in self.server.join_listeners:
+            self.server.join_listeners.remove(self.enqueue)
+        if self.server.matchmaker is self:
+            self.server.matchmaker = None
+
+    def enqueue(self, name):
+        """
+        Add a joining player to the queue.
+        Args:
+            name (str): The player's name.
+        Returns:
+            None
+        """
+        if name in self._entries:
+            return
+        joined_at = time.monotonic()
+        priority = self.priority_of(name)
+        self._entries[name] = (joined_at, priority)
+        heapq.heappush(self._heap, (joined_at - priority * self.priority_boost, next(self._order), name))
+
+    def take(self, count):
+        """
+        Remove and return up to count waiting players in seating order, recording their waits.
+        Players who disconnected while waiting are skipped.
+        Args:
+            count (int): Free seats to fill.
+        Returns:
+            list[str]: The names to seat.
+        """
+        names = []
+        now = time.monotonic()
+        while self._heap and len(names) < count:
+            name = heapq.heappop(self._heap)[2]
+            entry = self._entries.pop(name, None)
+            if entry is None or name not in self.server.writers:
+                continue
+            joined_at, priority = entry
+            wait = now - joined_at
+            self.wait_times.record(wait)
+            metrics.observe('matchmaking.wait', wait)
+            seated = self.seated_by_priority.setdefault(priority, [0, 0.0])
+            seated[0] += 1
+            seated[1] += wait
+            names.append(name)
+        return names
+
+    def waiting(self):
+        """
+        Return the players still waiting, dropping any who disconnected.
+        Returns:
+            list[tuple[str, float]]: (name, seconds waited) for each waiting player.
+        """
+        now = time.monotonic()
+        waiting = []
+        for name, (joined_at, priority) in list(self._entries.items()):
+            if name in self.server.writers:
+                waiting.append((name, now - joined_at))
+            else:
+                # Its heap entry is skipped when popped
+                del self._entries[name]
+        return waiting
+
+    def stats(self):
+        """
+        Return queue length, current and historical waits, and mean wait per priority level.
+        Returns:
+            dict: The matchmaking statistics.
+        """
+        waiting = self.waiting()
+        return {
+            'waiting': len(waiting),
+            'longest_wait_s': max((wait for _, wait in waiting), default=0.0),
+            'wait': self.wait_times.snapshot(),
+            'by_priority': {
+                priority: {'seated': seated, 'mean_wait_s': total / seated}
+                for priority, (seated, total) in sorted(self.seated_by_priority.items())
+            },
+        }
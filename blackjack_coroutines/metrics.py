@@ -0,0 +1,231 @@
+import json
+import os
+import signal
+import time
+
+
+class Histogram:
+    # Bucket i holds samples below 2**i microseconds, so 40 buckets reach ~12 days
+    BUCKETS = 40
+
+    def __init__(self):
+        """
+        Initialize an empty latency histogram with power-of-two microsecond buckets.
+        """
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        """
+        Record one latency sample.
+        Args:
+            seconds (float): The measured duration.
+        Returns:
+            None
+        """
+        index = int(seconds * 1e6).bit_length()
+        self.counts[min(index, self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """
+        Estimate a percentile from the bucket counts.
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.99.
+        Returns:
+            float: The upper bound of the matching bucket in seconds (0.0 if empty).
+        """
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min((1 << index) / 1e6, self.max)
+        return self.max
+
+    def snapshot(self):
+        """Return a JSON-friendly summary of the histogram."""
+        return {
+            'count': self.count,
+            'mean_ms': (self.total / self.count) * 1e3 if self.count else 0.0,
+            'p50_ms': self.percentile(0.50) * 1e3,
+            'p90_ms': self.percentile(0.90) * 1e3,
+            'p99_ms': self.percentile(0.99) * 1e3,
+            'max_ms': self.max * 1e3,
+        }
+
+
+class _NullTimer:
+    """Shared no-op timer handed out while metrics are disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.record(time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    def __init__(self, enabled=False):
+        """
+        Initialize a metrics registry.
+        Args:
+            enabled (bool, optional): Whether to record anything. Defaults to False.
+        """
+        self.enabled = enabled
+        self.histograms: dict[str, Histogram] = {}
+        self.counters: dict[str, int] = {}
+        self.profile_requests: dict[str, int] = {}  # {table_id: rounds left to profile}
+        self.profiles = {}  # {table_id: cProfile.Profile}
+        self.profiling = None  # table whose profiler is enabled, at most one at a time
+
+    def histogram(self, name):
+        """Get or create the histogram called name."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def timer(self, name):
+        """
+        Return a context manager that records the duration of its block under name.
+        Returns a shared no-op object when metrics are disabled.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(name))
+
+    def observe(self, name, seconds):
+        """Record a latency sample measured by the caller."""
+        if self.enabled:
+            self.histogram(name).record(seconds)
+
+    def increment(self, name, amount=1):
+        """Add amount to the counter called name."""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        """Drop all recorded histograms and counters."""
+        self.histograms.clear()
+        self.counters.clear()
+
+    def snapshot(self):
+        """
+        Return the current counters and histogram summaries.
+        Returns:
+            dict: JSON-friendly metrics snapshot.
+        """
+        return {
+            'timestamp': time.time(),
+            'counters': dict(self.counters),
+            'histograms': {name: histogram.snapshot() for name, histogram in self.histograms.items()},
+        }
+
+    def dump(self, path):
+        """
+        Write a snapshot to path as JSON.
+        Args:
+            path (str): Output file path.
+        Returns:
+            None
+        """
+        with open(path, 'w') as handle:
+            json.dump(self.snapshot(), handle, indent=2, sort_keys=True)
+        print(f"[Metrics] Snapshot written to {path}")
+
+    def dump_on_signal(self, path, signal_number=getattr(signal, 'SIGUSR1', None)):
+        """
+        Write a snapshot to path whenever the process receives signal_number (SIGUSR1 by default).
+        Does nothing on platforms without that signal.
+        """
+        if signal_number is None:
+            return
+        signal.signal(signal_number, lambda signum, frame: self.dump(path))
+
+    def request_profile(self, table_id, rounds=1):
+        """
+        Ask for cProfile to run on the next rounds played at table_id.
+        cProfile hooks the whole interpreter, so while a profiled round runs, every table
+        sharing the event loop is counted in the report too, and no other table's round can be
+        profiled until it finishes. Profile with a single table registered for a clean report.
+        Args:
+            table_id (str): The table to profile.
+            rounds (int, optional): Number of rounds to profile. Defaults to 1.
+        Returns:
+            None
+        """
+        self.profile_requests[table_id] = rounds
+
+    def start_profile(self, table_id):
+        """
+        Start profiling a round if one was requested for table_id and no other table's round
+        is being profiled; the request then waits for a later round.
+        Returns:
+            cProfile.Profile or None: The running profiler, if any.
+        """
+        if not self.profile_requests.get(table_id) or self.profiling is not None:
+            return None
+        profiler = self.profiles.get(table_id)
+        if profiler is None:
+            # Imported here so processes that never profile skip loading cProfile
+            import cProfile
+            profiler = self.profiles[table_id] = cProfile.Profile()
+        profiler.enable()
+        self.profiling = table_id
+        return profiler
+
+    def stop_profile(self, table_id, profiler):
+        """Stop a profiler started by start_profile and count down the request."""
+        if profiler is None:
+            return
+        profiler.disable()
+        self.profiling = None
+        self.profile_requests[table_id] -= 1
+
+    def profile_report(self, table_id, limit=25):
+        """
+        Return the collected cProfile statistics for table_id as text.
+        Args:
+            table_id (str): The profiled table.
+            limit (int, optional): Number of functions to list. Defaults to 25.
+        Returns:
+            str: The report, or an empty string if the table was never profiled.
+        """
+        profiler = self.profiles.get(table_id)
+        if profiler is None:
+            return ""
+        import io
+        import pstats
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(limit)
+        return output.getvalue()
+
+
+# Process-wide registry; set BLACKJACK_METRICS=1 to enable at startup
+metrics = Metrics(enabled=os.environ.get('BLACKJACK_METRICS') == '1')
@@ -1,19 +1,223 @@
 import asyncio
 import json
+import re
+import time
+from collections import deque
+from compression import ALGORITHM, FrameCompressor, FrameDecompressor
+from metrics import Histogram, metrics
+from timer_wheel import TimerWheel
+
+# Table watched by spectators that do not name one
+DEFAULT_TABLE_ID = "local"
+# Put on a player's response queue when they disconnect so waiting requests can give up
+DISCONNECTED = {"type": "disconnected"}
+# Put on a player's response queue when their decision deadline passes
+TIMED_OUT = {"type": "timed_out"}
+# Find a frame's session id in the raw line, so its rate limit can be charged before decoding.
+# Only the first or last key of the top-level object counts; a nested "session" never matches.
+SESSION_FIRST = re.compile(rb'\{\s*"session":\s*(\d+)\s*[,}]')
+SESSION_LAST = re.compile(rb'[{,]\s*"session":\s*(\d+)\s*\}\s*$')
+# Bytes at the end of a line searched for a trailing session key
+SESSION_TAIL = 64
+
+def raw_session_id(line):
+    """
+    Find the session id of an undecoded frame from its envelope.
+    Args:
+        line (bytes): The raw message line.
+    Returns:
+        int or None: The id in the top-level "session" key, or None if there is none.
+    """
+    match = SESSION_FIRST.match(line) or SESSION_LAST.search(line[-SESSION_TAIL:])
+    return int(match.group(1)) if match else None
+
+class StateStream:
+    def __init__(self):
+        """
+        Initialize a shared, coalescing stream of encoded state frames for one table.
+        Only the latest frame is kept: a spectator that is still draining the previous
+        frame skips straight to the newest one instead of queueing every update.
+        """
+        self.frame = None
+        self.version = 0
+        self.frames_published = 0
+        self.frames_coalesced = 0
+        self._updated = asyncio.Event()
+
+    def publish(self, data):
+        """
+        Replace the current frame and wake every waiting spectator.
+        Args:
+            data (bytes): The encoded state frame.
+        Returns:
+            None
+        """
+        self.frame = data
+        self.version += 1
+        self.frames_published += 1
+        updated, self._updated = self._updated, asyncio.Event()
+        updated.set()
+
+    async def feed(self, writer, compressor=None):
+        """
+        Send the latest frame to a spectator every time it changes.
+        Args:
+            writer (asyncio.StreamWriter): The stream writer for the spectator.
+            compressor (FrameCompressor, optional): The spectator's negotiated compressor. Defaults to None.
+        Returns:
+            None
+        """
+        seen_version = 0
+        try:
+            while True:
+                if self.version == seen_version:
+                    await self._updated.wait()
+                if self.version - seen_version > 1 and seen_version:
+                    self.frames_coalesced += self.version - seen_version - 1
+                seen_version = self.version
+                writer.write(compressor.compress(self.frame) if compressor is not None else self.frame)
+                await writer.drain()
+        except ConnectionError:
+            pass
+
+class TokenBucket:
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate, burst):
+        """
+        Initialize a token bucket that allows rate messages per second with bursts up to burst.
+        Args:
+            rate (float): Tokens added per second.
+            burst (int): Maximum tokens held.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def consume(self):
+        """
+        Take one token if available.
+        Returns:
+            bool: True if the message is allowed, False if it exceeds the rate.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+class Session:
+    __slots__ = ('writer', 'session_id', 'bucket', '_prefix')
+
+    def __init__(self, writer, session_id, bucket=None):
+        """
+        Initialize a logical player session carried on a multiplexed connection.
+        Sessions stand in for their connection's writer in AsyncServer.clients, so seating,
+        requests and broadcasts treat them like any other player.
+        Args:
+            writer (asyncio.StreamWriter): The connection carrying the session.
+            session_id (int): The id the client tags the session's frames with.
+            bucket (TokenBucket, optional): The session's own rate limit. Defaults to None.
+        """
+        self.writer = writer
+        self.session_id = session_id
+        self.bucket = bucket
+        self._prefix = b'{"session": %d, ' % session_id
+
+    def tag(self, data):
+        """
+        Tag an encoded frame with this session's id without decoding it again.
+        Args:
+            data (bytes): A frame from encode_message (a non-empty JSON object).
+        Returns:
+            bytes: The frame with a leading "session" key.
+        """
+        return self._prefix + data[1:]
+
+    def get_extra_info(self, name, default=None):
+        return self.writer.get_extra_info(name, default)
 
 class AsyncServer:
-    def __init__(self, host='0.0.0.0', port=8765):
+    # Window used to compute rounds per second for the stats endpoint
+    ROUND_RATE_WINDOW = 60.0
+    QUEUE_OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'disconnect')
+
+    def __init__(self, host='0.0.0.0', port=8765, stats_host='127.0.0.1', stats_port=None,
+                 max_frame_bytes=64 * 1024, message_rate=20.0, message_burst=40,
+                 max_rate_violations=100, max_queue_depth=32, queue_overflow='drop_oldest',
+                 decision_timeout=None, idle_timeout=None, timer_tick=0.1,
+                 compression=False, compression_level=6, max_sessions=0):
         """
         Initialize the AsyncServer instance.
         Args:
             host (str, optional): The host address to bind the server. Defaults to '0.0.0.0'.
             port (int, optional): The port number to bind the server. Defaults to 8765.
+            stats_host (str, optional): The address for the stats endpoint. Defaults to '127.0.0.1'.
+            stats_port (int, optional): The port for the stats endpoint. Disabled when None.
+            max_frame_bytes (int, optional): Longest accepted message line. Defaults to 64 KiB.
+            message_rate (float, optional): Sustained messages per second per connection, or None for
+                no limit (trusted load generators). Defaults to 20.
+            message_burst (int, optional): Messages a connection may send back to back. Defaults to 40.
+            max_rate_violations (int, optional): Rate-limited messages tolerated before disconnecting. Defaults to 100.
+            max_queue_depth (int, optional): Responses buffered per player. Defaults to 32.
+            queue_overflow (str, optional): 'drop_oldest', 'drop_newest' or 'disconnect' when a
+                player's queue is full. Defaults to 'drop_oldest'.
+            decision_timeout (float, optional): Seconds a player has to answer a bet or action
+                request before it is answered for them. Disabled when None.
+            idle_timeout (float, optional): Seconds without any message before a connection is
+                closed. Disabled when None.
+            timer_tick (float, optional): Resolution of the shared timer wheel. Defaults to 0.1.
+            compression (bool, optional): Accept clients' requests to compress the frames sent to
+                them. Defaults to False.
+            compression_level (int, optional): zlib level for compressed connections. Defaults to 6.
+            max_sessions (int, optional): Player sessions one connection may multiplex, for load
+                generators driving many seats over one socket. Defaults to 0 (multiplexing disabled).
         """
+        if queue_overflow not in self.QUEUE_OVERFLOW_POLICIES:
+            raise ValueError(f"queue_overflow must be one of {', '.join(self.QUEUE_OVERFLOW_POLICIES)}")
         self.host = host
         self.port = port
+        self.max_frame_bytes = max_frame_bytes
+        self.message_rate = message_rate
+        self.message_burst = message_burst
+        self.max_rate_violations = max_rate_violations
+        self.max_queue_depth = max_queue_depth
+        self.queue_overflow = queue_overflow
+        self.decision_timeout = decision_timeout
+        self.idle_timeout = idle_timeout
+        # One wheel tracks every deadline instead of an asyncio timer per pending decision
+        self.timers = TimerWheel(tick=timer_tick)
+        self.idle_timers = {}  # {writer: Timer}
+        self.decisions_timed_out = 0
+        self.compression = compression
+        self.compression_level = compression_level
+        self.compressors = {}  # {writer: FrameCompressor}
+        self.max_sessions = max_sessions
+        self.sessions = {}  # {writer: {session_id: Session}}
+        self.compression_stats = {'frames': 0, 'raw_bytes': 0, 'compressed_bytes': 0, 'seconds': 0.0}
+        self.abuse_counters = {'oversize_frames': 0, 'rate_limited': 0, 'queue_overflows': 0,
+                               'duplicate_joins': 0, 'abuse_disconnects': 0, 'rejected_sessions': 0}
         self.server = None
-        self.clients = {}  # {writer: name}
+        self.clients = {}  # {writer or Session: name}
+        self.writers = {}  # {name: writer or Session}, the reverse of clients
+        # Callables run as listener(name) when a player joins
+        self.join_listeners = []
+        self.matchmaker = None  # Matchmaker queueing joined players for seats, if any
         self.queues = {}   # {name: asyncio.Queue}
+        self.connections = set()  # every open writer, joined or not
+        self.tables = {}   # {table_id: GameEngine}
+        self.stats_host = stats_host
+        self.stats_port = stats_port
+        self.stats_server = None
+        self.started_at = time.monotonic()
+        self.rounds_played = 0
+        self.round_times = deque()
+        self.decision_latency = Histogram()
+        self.state_streams = {}  # {table_id: StateStream}
+        self.spectators = {}     # {writer: asyncio.Task feeding that spectator}
 
     async def start(self):
         """
@@ -21,10 +225,22 @@ class AsyncServer:
         Returns:
             None
         """
-        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        if self.stats_port is not None:
+            self.stats_server = await asyncio.start_server(self.handle_stats_client, self.stats_host, self.stats_port)
+            print(f"[Server] Stats available on {self.stats_host}:{self.stats_port}")
+        # The stream limit makes readline() refuse lines longer than max_frame_bytes
+        self.server = await asyncio.start_server(
+            self.handle_client, self.host, self.port, limit=self.max_frame_bytes + 1
+        )
         print(f"[Server] Listening on {self.host}:{self.port}")
-        async with self.server:
-            await self.server.serve_forever()
+        self.timers.start()
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            self.timers.stop()
+            if self.stats_server is not None:
+                self.stats_server.close()
 
     async def handle_client(self, reader, writer):
         """
@@ -37,22 +253,54 @@ class AsyncServer:
         """
         addr = writer.get_extra_info('peername')
         print(f"[Server] Connection from {addr}")
+        self.connections.add(writer)
+        bucket = TokenBucket(self.message_rate, self.message_burst) if self.message_rate is not None else None
+        violations = 0
+        if self.idle_timeout is not None:
+            self.idle_timers[writer] = self.timers.schedule(self.idle_timeout, self.expire_idle, writer)
         try:
             while True:
-                message = await self.recv_message(reader)
-                if message is None:
+                line = await self.recv_line(reader)
+                if line is None:
+                    break
+                # A line can still arrive after expire_idle has dropped the timer and is closing the connection
+                idle_timer = self.idle_timers.get(writer)
+                if idle_timer is not None:
+                    self.idle_timers[writer] = self.timers.reschedule(idle_timer, self.idle_timeout)
+                # Each session has its own rate limit; frames opening a session use the connection's
+                limiter = bucket
+                sessions = self.sessions.get(writer)
+                if sessions:
+                    session = sessions.get(raw_session_id(line))
+                    if session is not None:
+                        limiter = session.bucket
+                if limiter is not None and not limiter.consume():
+                    # Drop before decoding so floods cost other tables as little as possible
+                    self.abuse_counters['rate_limited'] += 1
+                    violations += 1
+                    if violations > self.max_rate_violations:
+                        self.abuse_counters['abuse_disconnects'] += 1
+                        print(f"[Server] {addr} exceeded the message rate limit.")
+                        break
+                    continue
+                message = self.decode_message(line)
+                session_id = message.get("session") if isinstance(message, dict) else None
+                if session_id is not None:
+                    await self.handle_session_message(message, session_id, reader, writer)
+                    continue
+                if not await self.handle_message(message, reader, writer):
                     break
-                await self.handle_message(message, reader, writer)
         except Exception as e:
             print(f"[Server] Error: {e}")
         finally:
             print(f"[Server] Disconnecting {addr}")
-            if writer in self.clients:
-                name = self.clients[writer]
-                del self.clients[writer]
-                print(f"[Server] Player {name} removed from game.")
-                if name in self.queues:
-                    del self.queues[name]
+            self.connections.discard(writer)
+            self.compressors.pop(writer, None)
+            self.timers.cancel(self.idle_timers.pop(writer, None))
+            self.remove_spectator(writer)
+            self.drop_client(writer)
+            for session in self.sessions.pop(writer, {}).values():
+                self.drop_client(session)
             writer.close()
             await writer.wait_closed()
 
@@ -64,25 +312,145 @@ class AsyncServer:
             reader (asyncio.StreamReader): The stream reader for the client.
             writer (asyncio.StreamWriter): The stream writer for the client.
         Returns:
-            None
+            bool: False if the connection should be closed, True otherwise.
         """
+        if not isinstance(message, dict):
+            await self.send_message(writer, {"type": "error", "message": "Messages must be JSON objects."})
+            return True
         message_type = message.get("type")
         if message_type == "join":
             name = message.get("name", "")
-            if not name:
+            if not name or not isinstance(name, str):
                 await self.send_message(writer, {"type": "error", "message": "Name required."})
-                return
+                return True
+            if writer in self.spectators:
+                await self.send_message(writer, {"type": "error", "message": "Spectators cannot join."})
+                return True
+            if name == self.clients.get(writer):
+                return True
+            if name in self.writers:
+                self.abuse_counters['duplicate_joins'] += 1
+                await self.send_message(writer, {"type": "error", "message": "Name already taken."})
+                return True
+            # A connection holds one seat; renaming releases the old queue instead of leaking it
+            previous_name = self.clients.get(writer)
+            if previous_name is not None:
+                del self.writers[previous_name]
+                self.release_queue(previous_name)
             self.clients[writer] = name
-            if name not in self.queues:
-                self.queues[name] = asyncio.Queue()
-            await self.broadcast_players()
+            self.writers[name] = writer
+            self.get_response_queue(name)
+            for listener in self.join_listeners:
+                listener(name)
+            if isinstance(writer, Session):
+                # Listing every seat to every session would cost O(sessions) per join
+                await self.send_message(writer, {"type": "join_ack", "players": [name]})
+            else:
+                await self.broadcast_players()
+        elif message_type == "hello":
+            await self.negotiate(writer, message.get("compression"))
+        elif message_type == "spectate":
+            await self.add_spectator(writer, message.get("table", DEFAULT_TABLE_ID))
         elif message_type in ("bet_response", "action_response"):
             # Find player name for this writer
             name = self.clients.get(writer)
             if name and name in self.queues:
-                await self.queues[name].put(message)
+                return self.enqueue_response(self.queues[name], message)
         else:
             print(f"[Server] Received: {message}")
+        return True
+
+    async def negotiate(self, writer, requested):
+        """
+        Answer a client's hello, switching the connection's outgoing frames to compression if
+        the client asked for it and this server allows it. A hello after compression is on or
+        after the connection started spectating is refused.
+        Args:
+            writer (asyncio.StreamWriter): The stream writer for the client.
+            requested (str): The compression the client asked for, or None.
+        Returns:
+            None
+        """
+        if writer in self.compressors or writer in self.spectators:
+            # The client is already decoding compressed frames, or a spectator feed has captured
+            # how this connection is encoded; a plain acknowledgement now would desync it
+            await self.send_message(writer, {"type": "error", "message": "Hello must come first and only once."})
+            return
+        accepted = ALGORITHM if self.compression and requested == ALGORITHM else None
+        # The acknowledgement is the last plain frame; nothing may be written between it and the switch
+        writer.write(self.encode_message({"type": "hello_ack", "compression": accepted}))
+        if accepted is not None and writer not in self.compressors:
+            self.compressors[writer] = FrameCompressor(self.compression_level)
+        await writer.drain()
+
+    async def handle_session_message(self, message, session_id, reader, writer):
+        """
+        Route a frame tagged with a session id to that session, opening it on first use.
+        Args:
+            message (dict): The received message.
+            session_id (int): The session the message belongs to.
+            reader (asyncio.StreamReader): The stream reader for the connection.
+            writer (asyncio.StreamWriter): The stream writer for the connection.
+        Returns:
+            None
+        """
+        sessions = self.sessions.setdefault(writer, {})
+        # Ids must be ints; anything else, even an unhashable list, is rejected with this frame alone
+        session = sessions.get(session_id) if type(session_id) is int else None
+        if session is None:
+            if type(session_id) is not int or len(sessions) >= self.max_sessions:
+                self.abuse_counters['rejected_sessions'] += 1
+                await self.send_message(writer, {"type": "error", "session": session_id, "message": "Session rejected."})
+                return
+            bucket = TokenBucket(self.message_rate, self.message_burst) if self.message_rate is not None else None
+            session = sessions[session_id] = Session(writer, session_id, bucket)
+        message_type = message.get("type")
+        if message_type == "leave":
+            del sessions[session_id]
+            self.drop_client(session)
+        elif message_type in ("join", "bet_response", "action_response"):
+            # Overflow policies apply per session; a disconnect policy closes just that session
+            if not await self.handle_message(message, reader, session):
+                del sessions[session_id]
+                self.drop_client(session)
+        else:
+            await self.send_message(session, {"type": "error", "message": "Sessions may only join, leave and respond."})
+
+    def drop_client(self, writer):
+        """
+        Remove a connection's or session's player, waking any request waiting on them.
+        Args:
+            writer (asyncio.StreamWriter or Session): The player's connection or session.
+        Returns:
+            None
+        """
+        name = self.clients.pop(writer, None)
+        if name is None:
+            return
+        del self.writers[name]
+        print(f"[Server] Player {name} removed from game.")
+        self.release_queue(name)
+
+    def enqueue_response(self, queue, message):
+        """
+        Put a player's response on their bounded queue, applying the overflow policy when full.
+        Args:
+            queue (asyncio.Queue): The player's response queue.
+            message (dict): The response message.
+        Returns:
+            bool: False if the policy is to disconnect the player, True otherwise.
+        """
+        if not queue.full():
+            queue.put_nowait(message)
+            return True
+        self.abuse_counters['queue_overflows'] += 1
+        if self.queue_overflow == 'drop_oldest':
+            queue.get_nowait()
+            queue.put_nowait(message)
+        elif self.queue_overflow == 'disconnect':
+            self.abuse_counters['abuse_disconnects'] += 1
+            return False
+        return True
 
     async def broadcast_players(self):
         """
@@ -93,11 +461,23 @@ class AsyncServer:
         players = list(self.clients.values())
         message = {"type": "join_ack", "players": players}
         for w in list(self.clients.keys()):
+            if isinstance(w, Session):
+                continue
             try:
                 await self.send_message(w, message)
             except Exception as e:
                 print(f"[Server] Failed to send to client: {e}")
 
+    def encode_message(self, message_dict):
+        """
+        Encode a message as a newline-terminated JSON frame.
+        Args:
+            message_dict (dict): The message to encode.
+        Returns:
+            bytes: The wire frame.
+        """
+        return (json.dumps(message_dict) + '\n').encode()
+
     async def send_message(self, writer, message_dict):
         """
         Send a JSON message to a client.
@@ -107,9 +487,44 @@ class AsyncServer:
         Returns:
             None
         """
-        data = json.dumps(message_dict) + '\n'
-        writer.write(data.encode())
+        await self.send_encoded(writer, self.encode_message(message_dict))
+
+    async def send_encoded(self, writer, data):
+        """
+        Send a frame produced by encode_message, so one encoding can go to many clients.
+        Args:
+            writer (asyncio.StreamWriter or Session): The stream writer or session for the client.
+            data (bytes): The encoded frame.
+        Returns:
+            None
+        """
+        if isinstance(writer, Session):
+            data = writer.tag(data)
+            writer = writer.writer
+        compressor = self.compressors.get(writer)
+        if compressor is not None:
+            data = self.compress_frame(compressor, data)
+        if not metrics.enabled:
+            writer.write(data)
+            await writer.drain()
+            return
+        start = time.perf_counter()
+        writer.write(data)
         await writer.drain()
+        metrics.observe('server.send', time.perf_counter() - start)
+        metrics.increment('server.messages_sent')
+        metrics.increment('server.bytes_sent', len(data))
+
+    def compress_frame(self, compressor, data):
+        """Compress a frame for one connection, recording the CPU time spent and bytes saved."""
+        start = time.perf_counter()
+        compressed = compressor.compress(data)
+        stats = self.compression_stats
+        stats['seconds'] += time.perf_counter() - start
+        stats['frames'] += 1
+        stats['raw_bytes'] += len(data)
+        stats['compressed_bytes'] += len(compressed)
+        return compressed
 
     async def recv_message(self, reader):
         """
@@ -119,10 +534,40 @@ class AsyncServer:
         Returns:
             dict or None: The received message as a dictionary, or None if connection is closed.
         """
-        line = await reader.readline()
-        if not line:
-            return None
-        return json.loads(line.decode())
+        line = await self.recv_line(reader)
+        return None if line is None else self.decode_message(line)
+
+    async def recv_line(self, reader):
+        """
+        Receive one raw message line from a client without decoding it.
+        Args:
+            reader (asyncio.StreamReader): The stream reader for the client.
+        Returns:
+            bytes or None: The newline-terminated line, or None if connection is closed.
+        """
+        try:
+            line = await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            self.abuse_counters['oversize_frames'] += 1
+            raise ValueError(f"Frame exceeds {self.max_frame_bytes} bytes")
+        return line or None
+
+    def decode_message(self, line):
+        """
+        Decode a message line received from a client.
+        Args:
+            line (bytes): The raw line.
+        Returns:
+            The decoded JSON value.
+        """
+        if not metrics.enabled:
+            return json.loads(line.decode())
+        start = time.perf_counter()
+        message = json.loads(line.decode())
+        metrics.observe('server.recv_decode', time.perf_counter() - start)
+        metrics.increment('server.messages_received')
+        metrics.increment('server.bytes_received', len(line))
+        return message
 
     def get_latest_response(self, writer):
         """
@@ -134,6 +579,63 @@ class AsyncServer:
         """
         return self.responses.pop(writer, None)
 
+    def release_queue(self, name):
+        """
+        Remove a player's response queue and wake anyone waiting on it with a disconnect message.
+        Args:
+            name (str): The player's name.
+        Returns:
+            None
+        """
+        queue = self.queues.pop(name, None)
+        if queue is None:
+            return
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(DISCONNECTED)
+
+    def expire_idle(self, writer):
+        """Close a connection that sent nothing for idle_timeout seconds."""
+        print(f"[Server] Closing idle connection {writer.get_extra_info('peername')}")
+        self.idle_timers.pop(writer, None)
+        writer.close()
+
+    def start_decision_timer(self, name):
+        """
+        Start the deadline for a bet or action request sent to a player.
+        Args:
+            name (str): The player's name.
+        Returns:
+            Timer or None: Handle for cancel_decision_timer, or None when decisions have no deadline.
+        """
+        if self.decision_timeout is None:
+            return None
+        return self.timers.schedule(self.decision_timeout, self.expire_decision, name)
+
+    def cancel_decision_timer(self, timer):
+        """Cancel a deadline started by start_decision_timer."""
+        self.timers.cancel(timer)
+
+    def expire_decision(self, name):
+        """Wake a request whose deadline passed with a TIMED_OUT marker."""
+        queue = self.queues.get(name)
+        if queue is None:
+            return
+        self.decisions_timed_out += 1
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(TIMED_OUT)
+
+    def find_writer(self, name):
+        """
+        Find the connection of a seated player.
+        Args:
+            name (str): The player's name.
+        Returns:
+            asyncio.StreamWriter, Session or None: The player's writer or session, or None if they are not connected.
+        """
+        return self.writers.get(name)
+
     def get_response_queue(self, name):
         """
         Get or create the response queue for a player by name.
@@ -142,18 +644,197 @@ class AsyncServer:
         Returns:
             asyncio.Queue: The response queue for the player.
         """
-        return self.queues.setdefault(name, asyncio.Queue())
+        queue = self.queues.get(name)
+        if queue is None:
+            queue = self.queues[name] = asyncio.Queue(maxsize=self.max_queue_depth)
+        return queue
+
+    def get_state_stream(self, table_id):
+        """Get or create the shared state stream for a table."""
+        stream = self.state_streams.get(table_id)
+        if stream is None:
+            stream = self.state_streams[table_id] = StateStream()
+        return stream
+
+    def publish_state(self, table_id, data):
+        """
+        Publish an encoded state frame to every spectator of a table.
+        Args:
+            table_id (str): The table the state belongs to.
+            data (bytes): The frame from encode_message.
+        Returns:
+            None
+        """
+        self.get_state_stream(table_id).publish(data)
+
+    async def add_spectator(self, writer, table_id):
+        """
+        Attach a connection to a table's state stream as a read-only spectator.
+        Args:
+            writer (asyncio.StreamWriter): The stream writer for the spectator.
+            table_id (str): The table to watch.
+        Returns:
+            None
+        """
+        if writer in self.clients:
+            await self.send_message(writer, {"type": "error", "message": "Players cannot spectate."})
+            return
+        self.remove_spectator(writer)
+        await self.send_message(writer, {"type": "spectate_ack", "table": table_id, "tables": sorted(self.tables)})
+        stream = self.get_state_stream(table_id)
+        self.spectators[writer] = asyncio.create_task(stream.feed(writer, self.compressors.get(writer)))
+
+    def remove_spectator(self, writer):
+        """Stop feeding a spectator, if the connection is one."""
+        task = self.spectators.pop(writer, None)
+        if task is not None:
+            task.cancel()
+
+    def register_table(self, game_engine):
+        """
+        Register a running table so it shows up in the stats endpoint.
+        Args:
+            game_engine (GameEngine): The table's engine.
+        Returns:
+            None
+        """
+        self.tables[game_engine.table_id] = game_engine
+
+    def unregister_table(self, game_engine):
+        """Remove a finished table from the stats endpoint."""
+        self.tables.pop(game_engine.table_id, None)
+
+    def record_round(self):
+        """Count a completed round for the rounds/sec figure."""
+        now = time.monotonic()
+        self.rounds_played += 1
+        self.round_times.append(now)
+        while self.round_times and now - self.round_times[0] > self.ROUND_RATE_WINDOW:
+            self.round_times.popleft()
+
+    def record_decision(self, seconds):
+        """Record how long a player took to answer a bet or action request."""
+        self.decision_latency.record(seconds)
+
+    def get_stats(self):
+        """
+        Collect a snapshot of the server's live state.
+        Returns:
+            dict: Connections, queue depths, outbound buffers, tables, round rate and decision latency.
+        """
+        now = time.monotonic()
+        while self.round_times and now - self.round_times[0] > self.ROUND_RATE_WINDOW:
+            self.round_times.popleft()
+        window = min(self.ROUND_RATE_WINDOW, now - self.started_at) or 1.0
+        outbound = {}
+        for writer in self.connections:
+            transport = writer.transport
+            if transport is not None and not transport.is_closing():
+                outbound[self.clients.get(writer, str(writer.get_extra_info('peername')))] = transport.get_write_buffer_size()
+        return {
+            'uptime_s': now - self.started_at,
+            'connections': len(self.connections),
+            'players': len(self.clients),
+            'sessions': sum(len(sessions) for sessions in self.sessions.values()),
+            'queue_depths': {name: queue.qsize() for name, queue in self.queues.items()},
+            'outbound_buffer_bytes': outbound,
+            'tables': {
+                table_id: {
+                    'players': len(engine.players),
+                    'round': engine.current_round,
+                    'shoe': engine.deck.composition.snapshot(),
+                }
+                for table_id, engine in self.tables.items()
+            },
+            'spectators': len(self.spectators),
+            'abuse': dict(self.abuse_counters),
+            'pending_timers': self.timers.pending,
+            'decisions_timed_out': self.decisions_timed_out,
+            'rounds_played': self.rounds_played,
+            'rounds_per_sec': len(self.round_times) / window,
+            'decision_latency': self.decision_latency.snapshot(),
+            'compression': {'connections': len(self.compressors), **self.compression_stats},
+            'matchmaking': self.matchmaker.stats() if self.matchmaker is not None else None,
+        }
+
+    async def handle_stats_client(self, reader, writer):
+        """
+        Answer one stats request and close the connection.
+        Accepts an HTTP GET (curl) or a plain line holding the same path (nc); see stats_response.
+        Args:
+            reader (asyncio.StreamReader): The stream reader for the stats client.
+            writer (asyncio.StreamWriter): The stream writer for the stats client.
+        Returns:
+            None
+        """
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            is_http = request_line.startswith(b'GET ')
+            parts = request_line.split()
+            target = parts[1 if is_http else 0] if len(parts) > int(is_http) else b'/'
+            status, content_type, body = self.stats_response(target.decode(errors='replace'))
+            if is_http:
+                header = (
+                    f"HTTP/1.0 {status}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n"
+                )
+                writer.write(header.encode() + body)
+            else:
+                writer.write(body + b'\n')
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            print(f"[Server] Stats request failed: {e}")
+        finally:
+            writer.close()
+
+    def stats_response(self, target):
+        """
+        Build the stats endpoint's answer to a request path.
+        - /profile?table=<id>&rounds=<n> runs cProfile on that table's next n rounds (default 1).
+        - /profile/report?table=<id> returns that table's collected profile as text.
+        - Any other path returns the stats snapshot.
+        Args:
+            target (str): The requested path and query.
+        Returns:
+            tuple[str, str, bytes]: HTTP status, content type and body.
+        """
+        path, _, query = target.partition('?')
+        if path not in ('/profile', '/profile/report'):
+            return '200 OK', 'application/json', json.dumps(self.get_stats()).encode()
+        # Only operators profiling a table pay for parsing a query string
+        from urllib.parse import parse_qs
+        params = parse_qs(query)
+        table_id = params.get('table', [DEFAULT_TABLE_ID])[0]
+        if table_id not in self.tables:
+            error = {'error': f"No table {table_id!r}", 'tables': sorted(self.tables)}
+            return '404 Not Found', 'application/json', json.dumps(error).encode()
+        if path == '/profile/report':
+            return '200 OK', 'text/plain', metrics.profile_report(table_id).encode()
+        try:
+            rounds = int(params.get('rounds', ['1'])[0])
+        except ValueError:
+            rounds = 0
+        if rounds < 1:
+            return '400 Bad Request', 'application/json', json.dumps({'error': "rounds must be a positive integer"}).encode()
+        metrics.request_profile(table_id, rounds)
+        print(f"[Server] Profiling the next {rounds} round(s) at {table_id}.")
+        return '200 OK', 'application/json', json.dumps({'profiling': table_id, 'rounds': rounds}).encode()
 
 class AsyncClient:
-    def __init__(self, host: str = '127.0.0.1', port: int = 8765):
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, compression: bool = False):
         """
         Initialize the AsyncClient instance.
         Args:
             host (str, optional): The server host to connect to. Defaults to '127.0.0.1'.
             port (int, optional): The server port to connect to. Defaults to 8765.
+            compression (bool, optional): Ask the server to compress the frames it sends. Servers
+                that do not allow it keep sending plain JSON lines. Defaults to False.
         """
         self.host = host
         self.port = port
+        self.compression = compression
+        self.decompressor: FrameDecompressor | None = None
         self.reader: asyncio.StreamReader | None = None
         self.writer: asyncio.StreamWriter | None = None
 
@@ -164,7 +845,10 @@ class AsyncClient:
             None
         """
         self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.decompressor = None
         print(f"[Client] Connected to {self.host}:{self.port}")
+        if self.compression:
+            await self.send_message({"type": "hello", "compression": ALGORITHM})
 
     async def send_message(self, message_dict):
         """
@@ -188,7 +872,113 @@ class AsyncClient:
         """
         if self.reader is None:
             raise RuntimeError("Not connected: reader is None")
-        line = await self.reader.readline()
-        if not line:
-            return None
-        return json.loads(line.decode())
\ No newline at end of file
+        while True:
+            if self.decompressor is not None:
+                line = await self.decompressor.read_frame(self.reader)
+            else:
+                line = await self.reader.readline()
+            if not line:
+                return None
+            message = json.loads(line.decode())
+            if message.get("type") == "hello_ack":
+                # Every frame after the acknowledgement is compressed
+                if message.get("compression") == ALGORITHM:
+                    self.decompressor = FrameDecompressor()
+                continue
+            return message
+
+class ClientSession:
+    __slots__ = ('client', 'session_id', 'inbox')
+
+    def __init__(self, client, session_id):
+        """
+        Initialize one logical player session of a MultiplexClient.
+        Has the same send_message/recv_message interface as AsyncClient.
+        Args:
+            client (MultiplexClient): The connection carrying the session.
+            session_id (int): The session's id.
+        """
+        self.client = client
+        self.session_id = session_id
+        self.inbox = asyncio.Queue()
+
+    async def send_message(self, message_dict):
+        """
+        Send a JSON message to the server on this session.
+        Args:
+            message_dict (dict): The message to send.
+        Returns:
+            None
+        """
+        await self.client.connection.send_message({**message_dict, "session": self.session_id})
+
+    async def recv_message(self):
+        """
+        Receive the next message addressed to this session.
+        Returns:
+            dict or None: The message, or None once the connection is closed.
+        """
+        return await self.inbox.get()
+
+    async def close(self):
+        """Leave the server, freeing the session's seat."""
+        await self.send_message({"type": "leave"})
+        self.client.sessions.pop(self.session_id, None)
+
+class MultiplexClient:
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, compression: bool = False):
+        """
+        Initialize a client that carries many player sessions over one connection.
+        The server must allow multiplexing with max_sessions.
+        Args:
+            host (str, optional): The server host to connect to. Defaults to '127.0.0.1'.
+            port (int, optional): The server port to connect to. Defaults to 8765.
+            compression (bool, optional): Ask the server to compress the frames it sends. Defaults to False.
+        """
+        self.connection = AsyncClient(host, port, compression)
+        self.sessions: dict[int, ClientSession] = {}
+        self.next_session_id = 0
+        self.dispatcher: asyncio.Task | None = None
+
+    async def connect(self):
+        """
+        Connect to the server and start routing incoming frames to their sessions.
+        Returns:
+            None
+        """
+        await self.connection.connect()
+        self.dispatcher = asyncio.create_task(self.dispatch())
+
+    def open_session(self):
+        """
+        Open a new session. It is created on the server by its first message, normally a join.
+        Returns:
+            ClientSession: The session.
+        """
+        session = ClientSession(self, self.next_session_id)
+        self.sessions[session.session_id] = session
+        self.next_session_id += 1
+        return session
+
+    async def dispatch(self):
+        """Read frames until the connection closes, handing each to the session it is tagged with."""
+        try:
+            while True:
+                message = await self.connection.recv_message()
+                if message is None:
+                    break
+                session = self.sessions.get(message.pop("session", None))
+                if session is None:
+                    print(f"[Client] Message for unknown session: {message}")
+                    continue
+                session.inbox.put_nowait(message)
+        finally:
+            for session in self.sessions.values():
+                session.inbox.put_nowait(None)
+
+    async def close(self):
+        """Close the connection, ending every session."""
+        if self.connection.writer is not None:
+            self.connection.writer.close()
+        if self.dispatcher is not None:
+            await asyncio.gather(self.dispatcher, return_exceptions=True)
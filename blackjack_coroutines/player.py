@@ -1,20 +1,28 @@
 from card import Deck
-from blackjack_rules import calculate_hand_value
+from blackjack_rules import DEFAULT_RULES, calculate_hand_value
 import asyncio
 
 class Player:
-    def __init__(self, name, chips=1000):
+    # Pause after each dealt card so terminal players can follow the deal
+    DEAL_DELAY = 0.5
+    __slots__ = ('name', 'chips', 'hand', 'mustStand', 'current_bet', 'actions', 'ledger', '_hand_cache')
+
+    def __init__(self, name, chips=1000, ledger=None):
         """
         Initialize a Player instance.
         Args:
             name (str): The player's name.
             chips (int, optional): The starting number of chips. Defaults to 1000.
+            ledger (ChipLedger, optional): Persistent ledger that records chip movements. Defaults to None.
         """
+        self.ledger = ledger
         self.name = name
         self.chips = chips
         self.hand = []
         self.mustStand = False
         self.current_bet = 0
+        self.actions = []  # 'hit', 'stand' and 'double' taken this round, in order
+        self._hand_cache = (None, 0, '')  # (hand list, card count, text)
         
     def place_bet(self, amount):
         """
@@ -33,9 +41,34 @@ class Player:
         else:
             self.chips -= amount
             self.current_bet = amount
+            self.record_chips('bet', -amount)
             print(f"{self.name} bets {amount}. Remaining chips: {self.chips}")
             return True
         
+    def collect_payout(self, amount):
+        """
+        Add a round's payout to the player's chips.
+        Args:
+            amount (int): The chips paid out (0 for a loss).
+        Returns:
+            None
+        """
+        self.chips += amount
+        if amount:
+            self.record_chips('payout', amount)
+
+    def record_chips(self, kind, amount):
+        """
+        Record a chip movement in the ledger, if the player has one.
+        Args:
+            kind (str): 'bet', 'double', 'payout' or 'top_up'.
+            amount (int): Chips added (positive) or removed (negative).
+        Returns:
+            None
+        """
+        if self.ledger is not None:
+            self.ledger.record(self.name, kind, amount, self.chips)
+
     async def add_card(self, card):
         """
         Add a card to the player's hand.
@@ -49,7 +82,7 @@ class Player:
             return
         
         self.hand.append(card)
-        await asyncio.sleep(0.5)
+        await asyncio.sleep(self.DEAL_DELAY)
         print(f"{self.name} receives card: {card}. Current hand: {self.show_hand()}, value: {calculate_hand_value(self.hand)}")
         
     def show_hand(self, hide_first=False):
@@ -62,8 +95,25 @@ class Player:
         """
         if hide_first and self.hand:
             return f"[Hidden], {', '.join(str(card) for card in self.hand[1:])}"
-        else:
-            return ', '.join(str(card) for card in self.hand)
+        # Hands only grow by append or get replaced, so the list and its length identify the text
+        hand, count, text = self._hand_cache
+        if hand is not self.hand or count != len(self.hand):
+            text = ', '.join(str(card) for card in self.hand)
+            self._hand_cache = (self.hand, len(self.hand), text)
+        return text
+
+    def to_state(self):
+        """
+        Return the player's public state for broadcasting to clients.
+        Returns:
+            dict: Name, chips, hand text and current bet.
+        """
+        return {
+            'name': self.name,
+            'chips': self.chips,
+            'hand': self.show_hand(),
+            'current_bet': self.current_bet
+        }
         
     def reset_hand(self):
         """
@@ -74,12 +124,14 @@ class Player:
         self.hand = []
         self.mustStand = False
         self.current_bet = 0
+        self.actions = []
         print(f"{self.name}'s hand has been reset.")
         
     async def handle_hit(self, deck: Deck):
         """
         Handle the player's action to hit (draw a card).
         """
+        self.actions.append('hit')
         card = deck.deal_card()
         if card:
             await self.add_card(card)
@@ -90,6 +142,7 @@ class Player:
         """
         Handle the player's action to stand (no more cards).
         """
+        self.actions.append('stand')
         print(f"{self.name} stands with hand value: {calculate_hand_value(self.hand)}")
     
     async def handle_double_down(self, deck: Deck):
@@ -98,7 +151,9 @@ class Player:
         - Doubles the bet and takes exactly one more card.
         """
         if self.chips >= self.current_bet:
+            self.actions.append('double')
             self.chips -= self.current_bet
+            self.record_chips('double', -self.current_bet)
             self.current_bet *= 2
             print(f"{self.name} doubles down! New bet: {self.current_bet}")
             card = deck.deal_card()
@@ -117,25 +172,33 @@ class Player:
         """
         if self.chips == 0:
             self.chips += 100
+            self.record_chips('top_up', 100)
             print(f"{self.name} is out of chips! Adding 100 chips to keep playing.")
 
 class Dealer(Player):
+    __slots__ = ('rules',)
 
-    def __init__(self):
+    def __init__(self, rules=DEFAULT_RULES):
+        """
+        Initialize the Dealer.
+        Args:
+            rules (RuleSet, optional): The table's rule variant. Defaults to DEFAULT_RULES.
+        """
         super().__init__(name="Dealer")
         self.hand = []
+        self.rules = rules
     
     def should_hit(self):
         """
-        Determine if the dealer should hit based on standard Blackjack rules.
+        Determine if the dealer should hit based on the table's dealer rule (S17, H17 or A17).
         Returns:
             bool: True if the dealer should hit, False otherwise.
         """
-        return calculate_hand_value(self.hand) <= 17
+        return self.rules.dealer_should_hit(self.hand)
     
     async def add_hidden_card(self, card):
         self.hand.append(card)
-        await asyncio.sleep(0.5)
+        await asyncio.sleep(self.DEAL_DELAY)
         print("Dealer receives a hidden card.")
     
     def show_hidden_card(self):
@@ -0,0 +1,236 @@
+import json
+import mmap
+import os
+
+from card import Card
+
+# Column name -> struct format code of its fixed-width element
+COLUMNS = {
+    'round_id': 'Q',       # uint64, assigned by the writer
+    'seat': 'B',           # uint8, index of the player at the table
+    'bet': 'I',            # uint32, total chips wagered including doubles
+    'initial_hand': 'H',   # uint16, see encode_hand
+    'dealer_upcard': 'B',  # uint8, rank index of the dealer's face-up card
+    'actions': 'I',        # uint32, see encode_actions
+    'outcome': 'B',        # uint8, index into OUTCOMES
+    'payout': 'I',         # uint32, chips returned to the player
+}
+ITEM_SIZES = {'Q': 8, 'I': 4, 'H': 2, 'B': 1}
+NUMPY_DTYPES = {'Q': '<u8', 'I': '<u4', 'H': '<u2', 'B': 'u1'}
+OUTCOMES = ('lose', 'push', 'win', 'blackjack')
+ACTION_CODES = {'hit': 1, 'stand': 2, 'double': 3}
+# Two bits per action, so a uint32 holds this many
+MAX_ACTIONS = 16
+RANK_INDEX = {rank: index for index, rank in enumerate(Card.RANKS)}
+META_FILE = 'meta.json'
+
+
+def encode_hand(cards):
+    """Encode the first two cards of a hand as first_rank * 13 + second_rank."""
+    return RANK_INDEX[cards[0].rank] * len(Card.RANKS) + RANK_INDEX[cards[1].rank]
+
+
+def decode_hand(code):
+    """Return the two ranks encoded by encode_hand."""
+    return Card.RANKS[code // len(Card.RANKS)], Card.RANKS[code % len(Card.RANKS)]
+
+
+def encode_actions(actions):
+    """
+    Pack an action sequence into an integer, two bits per action, first action lowest.
+    Sequences longer than MAX_ACTIONS keep their first MAX_ACTIONS actions.
+    """
+    code = 0
+    for position, action in enumerate(actions[:MAX_ACTIONS]):
+        code |= ACTION_CODES[action] << (2 * position)
+    return code
+
+
+def decode_actions(code):
+    """Return the action list packed by encode_actions."""
+    names = {value: name for name, value in ACTION_CODES.items()}
+    actions = []
+    while code:
+        actions.append(names[code & 3])
+        code >>= 2
+    return actions
+
+
+class RoundStoreWriter:
+    def __init__(self, directory, chunk_rows=1 << 16):
+        """
+        Open (or create) a columnar round store for appending.
+        Each column is its own memory-mapped file that grows chunk_rows rows at a time;
+        meta.json records how many rows are complete.
+        Args:
+            directory (str): Directory holding the column files.
+            chunk_rows (int, optional): Rows added each time the files grow. Defaults to 65536.
+        """
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        os.makedirs(directory, exist_ok=True)
+        self.count = read_row_count(directory)
+        self.next_round_id = read_meta(directory).get('next_round_id', 0)
+        self.capacity = 0
+        self._files = {}
+        self._maps = {}
+        self._views = {}
+        for name in COLUMNS:
+            path = os.path.join(directory, f"{name}.col")
+            self._files[name] = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        self._grow(self.count + chunk_rows)
+
+    def _release_maps(self):
+        for view in self._views.values():
+            view.release()
+        for column_map in self._maps.values():
+            column_map.close()
+        self._views.clear()
+        self._maps.clear()
+
+    def _grow(self, rows):
+        self._release_maps()
+        for name, code in COLUMNS.items():
+            handle = self._files[name]
+            handle.truncate(rows * ITEM_SIZES[code])
+            self._maps[name] = mmap.mmap(handle.fileno(), rows * ITEM_SIZES[code])
+            self._views[name] = memoryview(self._maps[name]).cast(code)
+        self.capacity = rows
+
+    def append(self, round_id, seat, bet, initial_hand, dealer_upcard, actions, outcome, payout):
+        """
+        Append one settled hand. Values are already encoded integers.
+        Returns:
+            None
+        """
+        row = self.count
+        if row >= self.capacity:
+            self._grow(self.capacity + self.chunk_rows)
+        views = self._views
+        views['round_id'][row] = round_id
+        views['seat'][row] = seat
+        views['bet'][row] = bet
+        views['initial_hand'][row] = initial_hand
+        views['dealer_upcard'][row] = dealer_upcard
+        views['actions'][row] = actions
+        views['outcome'][row] = outcome
+        views['payout'][row] = payout
+        self.count = row + 1
+
+    def record_round(self, engine, settlements):
+        """
+        Append every settled hand of a round; usable as a GameEngine round listener.
+        Args:
+            engine (GameEngine): The table that played the round.
+            settlements (list[tuple]): (player, result, payout) from payout_winner.
+        Returns:
+            None
+        """
+        round_id = self.next_round_id
+        self.next_round_id += 1
+        upcard = RANK_INDEX[engine.dealer.hand[0].rank]
+        seats = {player.name: seat for seat, player in enumerate(engine.players)}
+        for player, result, payout in settlements:
+            self.append(
+                round_id,
+                seats.get(player.name, 0),
+                player.current_bet,
+                encode_hand(player.hand),
+                upcard,
+                encode_actions(player.actions),
+                OUTCOMES.index(result),
+                payout,
+            )
+
+    def flush(self):
+        """
+        Write the mapped pages to disk and publish the new row count.
+        Rows appended after the last flush are ignored by readers after a crash.
+        Returns:
+            None
+        """
+        for column_map in self._maps.values():
+            column_map.flush()
+        meta_path = os.path.join(self.directory, META_FILE)
+        temporary_path = meta_path + '.tmp'
+        with open(temporary_path, 'w') as handle:
+            json.dump({'rows': self.count, 'next_round_id': self.next_round_id, 'columns': COLUMNS}, handle)
+        os.replace(temporary_path, meta_path)
+
+    def close(self):
+        """Flush, unmap and trim the column files to the rows written."""
+        self.flush()
+        self._release_maps()
+        for name, handle in self._files.items():
+            handle.truncate(self.count * ITEM_SIZES[COLUMNS[name]])
+            handle.close()
+
+
+class RoundStoreReader:
+    def __init__(self, directory):
+        """
+        Open a round store read-only. Columns are memory-mapped, so nothing is loaded up front.
+        Args:
+            directory (str): Directory written by RoundStoreWriter.
+        """
+        self.directory = directory
+        self.count = read_row_count(directory)
+        self._maps = {}
+        for name, code in COLUMNS.items():
+            size = self.count * ITEM_SIZES[code]
+            if size == 0:
+                continue
+            with open(os.path.join(directory, f"{name}.col"), 'rb') as handle:
+                self._maps[name] = mmap.mmap(handle.fileno(), size, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.count
+
+    def column(self, name):
+        """
+        Return a zero-copy memoryview of a column.
+        Args:
+            name (str): One of COLUMNS.
+        Returns:
+            memoryview: Typed view of count elements.
+        """
+        if name not in self._maps:
+            return memoryview(b'').cast(COLUMNS[name])
+        return memoryview(self._maps[name]).cast(COLUMNS[name])
+
+    def numpy_column(self, name):
+        """
+        Return a column as a zero-copy, read-only NumPy array.
+        Requires NumPy, which is only imported here.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("NumPy is required for numpy_column(); use column() for a memoryview.") from None
+        if name not in self._maps:
+            return numpy.empty(0, dtype=NUMPY_DTYPES[COLUMNS[name]])
+        return numpy.frombuffer(self._maps[name], dtype=NUMPY_DTYPES[COLUMNS[name]], count=self.count)
+
+    def numpy_columns(self):
+        """Return every column as a zero-copy NumPy array, keyed by name."""
+        return {name: self.numpy_column(name) for name in COLUMNS}
+
+    def close(self):
+        """Unmap the column files. Views and arrays taken from this reader must be released first."""
+        for column_map in self._maps.values():
+            column_map.close()
+        self._maps.clear()
+
+
+def read_meta(directory):
+    """Return the store's metadata, or an empty dict for a new store."""
+    try:
+        with open(os.path.join(directory, META_FILE)) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+
+
+def read_row_count(directory):
+    """Return the number of rows published by the last flush."""
+    return read_meta(directory).get('rows', 0)
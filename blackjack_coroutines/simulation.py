@@ -0,0 +1,396 @@
+import asyncio
+import contextlib
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from statistics import NormalDist
+
+from blackjack_rules import DEFAULT_RULES, calculate_hand_value
+from game_engine import GameEngine, create_players, reset_for_new_round
+from player import Player
+
+
+class RunningStats:
+    __slots__ = ('count', 'mean', '_m2')
+
+    def __init__(self):
+        """
+        Initialize Welford running mean/variance accumulators.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value):
+        """
+        Add one observation in O(1) time and memory.
+        Args:
+            value (float): The observation.
+        Returns:
+            None
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def variance(self):
+        """Return the sample variance (0.0 with fewer than two observations)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def stderr(self):
+        """Return the standard error of the mean."""
+        return math.sqrt(self.variance() / self.count) if self.count else math.inf
+
+    def ci_half_width(self, confidence=0.95):
+        """
+        Return the half-width of the normal-approximation confidence interval for the mean.
+        Args:
+            confidence (float, optional): Confidence level. Defaults to 0.95.
+        Returns:
+            float: The half-width, or infinity with fewer than two observations.
+        """
+        if self.count < 2:
+            return math.inf
+        return NormalDist().inv_cdf((1 + confidence) / 2) * self.stderr()
+
+    def snapshot(self, confidence=0.95):
+        """Return count, mean, variance and confidence interval as a dict."""
+        half_width = self.ci_half_width(confidence)
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'variance': self.variance(),
+            'ci_low': self.mean - half_width,
+            'ci_high': self.mean + half_width,
+        }
+
+
+class EVAggregator:
+    def __init__(self, confidence=0.95, target_ci_width=None, min_rounds=1000):
+        """
+        Initialize a streaming EV aggregator keyed by (strategy, rule set).
+        Args:
+            confidence (float, optional): Confidence level for the stopping rule. Defaults to 0.95.
+            target_ci_width (float, optional): Full interval width, in units of the base bet, at
+                which a key counts as converged. Never converges when None.
+            min_rounds (int, optional): Observations required before convergence is checked. Defaults to 1000.
+        """
+        self.confidence = confidence
+        self.target_ci_width = target_ci_width
+        self.min_rounds = min_rounds
+        self.stats: dict[tuple[str, str], RunningStats] = {}
+
+    def record(self, key, ev):
+        """
+        Add one hand's result.
+        Args:
+            key (tuple[str, str]): (strategy name, rule set description).
+            ev (float): Net chips won or lost divided by the base bet.
+        Returns:
+            None
+        """
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = RunningStats()
+        stats.push(ev)
+
+    def listener(self, key, base_bet):
+        """
+        Build a GameEngine round listener that records every settled hand under key.
+        Args:
+            key (tuple[str, str]): (strategy name, rule set description).
+            base_bet (int): The flat bet used to normalise results.
+        Returns:
+            callable: A listener for GameEngine.round_listeners.
+        """
+        def on_round(engine, settlements):
+            for player, result, payout in settlements:
+                self.record(key, (payout - player.current_bet) / base_bet)
+        return on_round
+
+    def converged(self, key):
+        """Return True once key's confidence interval is narrower than the target width."""
+        stats = self.stats.get(key)
+        if self.target_ci_width is None or stats is None or stats.count < self.min_rounds:
+            return False
+        return 2 * stats.ci_half_width(self.confidence) <= self.target_ci_width
+
+    def summary(self):
+        """Return a snapshot per key, with keys rendered as 'strategy | rules'."""
+        return {
+            f"{strategy} | {rules}": stats.snapshot(self.confidence)
+            for (strategy, rules), stats in self.stats.items()
+        }
+
+
+def threshold_strategy(engine, stand_on=17, bet=10):
+    """
+    Build a player_input_strategy that bets a flat amount and hits below stand_on.
+    A seat with fewer chips than the flat bet bets everything it has, since a bet it cannot
+    cover would be asked for again forever.
+    Args:
+        engine (GameEngine): The engine whose players the bots control.
+        stand_on (int, optional): Hand value to stand on. Defaults to 17.
+        bet (int, optional): Flat bet. Defaults to 10.
+    Returns:
+        dict: Player name -> async input function.
+    """
+    players = {player.name: player for player in engine.players}
+
+    async def respond(prompt):
+        name = prompt.split(',', 1)[0]
+        if 'bet' in prompt:
+            return str(min(bet, players[name].chips))
+        return 'hit' if calculate_hand_value(players[name].hand) < stand_on else 'stand'
+
+    return {name: respond for name in players}
+
+
+async def simulate(aggregator, strategy_name, make_strategy, rules=DEFAULT_RULES,
+                   max_rounds=1_000_000, seats=1, base_bet=10, check_every=100):
+    """
+    Play headless rounds until the aggregator's target CI width is reached or max_rounds run out.
+    Args:
+        aggregator (EVAggregator): Receives every settled hand.
+        strategy_name (str): Name used in the aggregator key.
+        make_strategy (callable): make_strategy(engine) -> player_input_strategy dict.
+        rules (RuleSet, optional): The rule variant to play. Defaults to DEFAULT_RULES.
+        max_rounds (int, optional): Upper bound on rounds. Defaults to 1,000,000.
+        seats (int, optional): Players at the table. Defaults to 1.
+        base_bet (int, optional): Flat bet the strategy places. Defaults to 10.
+        check_every (int, optional): Rounds between convergence checks. Defaults to 100.
+    Returns:
+        int: Rounds played.
+    """
+    key = (strategy_name, rules.describe())
+    engine = GameEngine(table_id=f"sim-{strategy_name}", rules=rules)
+    engine.players = create_players([f"Seat{seat}" for seat in range(seats)])
+    engine.round_listeners.append(aggregator.listener(key, base_bet))
+    strategy = make_strategy(engine)
+    rounds = 0
+    while rounds < max_rounds:
+        await engine.play_round(strategy)
+        reset_for_new_round(engine.players, engine.dealer)
+        rounds += 1
+        if rounds % check_every == 0 and aggregator.converged(key):
+            break
+    return rounds
+
+
+def run_sweep(strategies, rule_sets, target_ci_width, confidence=0.95, max_rounds=1_000_000, **options):
+    """
+    Simulate every strategy under every rule set, stopping each once its EV is known closely enough.
+    Args:
+        strategies (dict): Strategy name -> make_strategy(engine) callable.
+        rule_sets (list[RuleSet]): Rule variants to play.
+        target_ci_width (float): Confidence interval width, in base bets, that ends a run.
+        confidence (float, optional): Confidence level. Defaults to 0.95.
+        max_rounds (int, optional): Upper bound on rounds per combination. Defaults to 1,000,000.
+    Returns:
+        tuple[EVAggregator, dict]: The aggregator and rounds played per 'strategy | rules'.
+    """
+    aggregator = EVAggregator(confidence, target_ci_width)
+    rounds_played = {}
+    previous_delay = Player.DEAL_DELAY
+    Player.DEAL_DELAY = 0
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for rules in rule_sets:
+                for name, make_strategy in strategies.items():
+                    rounds_played[f"{name} | {rules.describe()}"] = asyncio.run(
+                        simulate(aggregator, name, make_strategy, rules, max_rounds, **options)
+                    )
+    finally:
+        Player.DEAL_DELAY = previous_delay
+    return aggregator, rounds_played
+
+
+class SharedCounters:
+    # int64 fields of one worker's slot. SEQ is odd while the worker is mid-update.
+    FIELDS = ('seq', 'rounds', 'hands', 'win', 'lose', 'push', 'blackjack', 'wagered', 'net', 'net_squared')
+    SEQ, ROUNDS, HANDS, WIN, LOSE, PUSH, BLACKJACK, WAGERED, NET, NET_SQUARED = range(len(FIELDS))
+    OUTCOME_FIELDS = {'win': WIN, 'lose': LOSE, 'push': PUSH, 'blackjack': BLACKJACK}
+    # The header holds a single stop flag the coordinator sets to end every worker early
+    HEADER = 1
+    ITEM_SIZE = 8
+
+    def __init__(self, slots, name=None):
+        """
+        Create, or attach to, a block of per-worker counters in shared memory.
+        Each slot has exactly one writer, so updates need no lock: the writer bumps the slot's
+        sequence number before and after each update and readers retry torn reads (a seqlock).
+        Args:
+            slots (int): Number of worker slots.
+            name (str, optional): Name of an existing block to attach to. Creates one when None.
+        """
+        self.slots = slots
+        size = (self.HEADER + slots * len(self.FIELDS)) * self.ITEM_SIZE
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.values = self.shm.buf.cast('q')
+        if self.owner:
+            for index in range(len(self.values)):
+                self.values[index] = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def offset(self, slot):
+        """Return the index of slot's first field."""
+        return self.HEADER + slot * len(self.FIELDS)
+
+    def record_round(self, slot, settlements):
+        """
+        Add one round's settlements to a worker's slot. Only that worker may call this.
+        Args:
+            slot (int): The worker's slot.
+            settlements (list[tuple[Player, str, int]]): (player, result, payout) per hand.
+        Returns:
+            None
+        """
+        values = self.values
+        base = self.offset(slot)
+        values[base + self.SEQ] += 1
+        values[base + self.ROUNDS] += 1
+        for player, result, payout in settlements:
+            net = payout - player.current_bet
+            values[base + self.HANDS] += 1
+            values[base + self.OUTCOME_FIELDS[result]] += 1
+            values[base + self.WAGERED] += player.current_bet
+            values[base + self.NET] += net
+            values[base + self.NET_SQUARED] += net * net
+        values[base + self.SEQ] += 1
+
+    def read_slot(self, slot):
+        """
+        Return a consistent copy of one worker's counters without blocking the worker.
+        Args:
+            slot (int): The worker's slot.
+        Returns:
+            dict: Field name -> value.
+        """
+        base = self.offset(slot)
+        end = base + len(self.FIELDS)
+        while True:
+            before = self.values[base + self.SEQ]
+            if before % 2 == 0:
+                fields = self.values[base:end].tolist()
+                if self.values[base + self.SEQ] == before:
+                    return dict(zip(self.FIELDS, fields))
+            time.sleep(0)
+
+    def aggregate(self, base_bet):
+        """
+        Sum every worker's slot.
+        Args:
+            base_bet (int): The flat bet used to normalise EV.
+        Returns:
+            dict: Totals per field, plus EV per hand and its standard error in base bets.
+        """
+        totals = dict.fromkeys(self.FIELDS[1:], 0)
+        for slot in range(self.slots):
+            for field, value in self.read_slot(slot).items():
+                if field != 'seq':
+                    totals[field] += value
+        hands = totals['hands']
+        if hands:
+            mean = totals['net'] / hands
+            variance = max(totals['net_squared'] / hands - mean * mean, 0.0)
+            totals['ev'] = mean / base_bet
+            totals['stderr'] = math.sqrt(variance / hands) / base_bet
+        else:
+            totals['ev'] = 0.0
+            totals['stderr'] = math.inf
+        return totals
+
+    def request_stop(self):
+        """Ask every worker to finish after its current round."""
+        self.values[0] = 1
+
+    def stop_requested(self):
+        return self.values[0] != 0
+
+    def close(self):
+        """Detach from the block, and free it if this instance created it."""
+        self.values.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+async def _worker_rounds(counters, slot, strategy_name, make_strategy, rules, max_rounds, seats):
+    engine = GameEngine(table_id=f"sim-{strategy_name}-{slot}", rules=rules)
+    engine.players = create_players([f"Seat{seat}" for seat in range(seats)])
+    engine.round_listeners.append(lambda engine, settlements: counters.record_round(slot, settlements))
+    strategy = make_strategy(engine)
+    rounds = 0
+    while rounds < max_rounds and not counters.stop_requested():
+        await engine.play_round(strategy)
+        reset_for_new_round(engine.players, engine.dealer)
+        rounds += 1
+    return rounds
+
+
+def _parallel_worker(counters_name, slots, slot, strategy_name, make_strategy, rules, max_rounds, seats):
+    """Process-pool entry point: play rounds, publishing progress to the worker's shared slot."""
+    # Forked workers inherit the parent's generator state and would deal identical shoes
+    random.seed()
+    Player.DEAL_DELAY = 0
+    counters = SharedCounters(slots, counters_name)
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            return asyncio.run(
+                _worker_rounds(counters, slot, strategy_name, make_strategy, rules, max_rounds, seats)
+            )
+    finally:
+        counters.close()
+
+
+def run_parallel(strategy_name, make_strategy, rules=DEFAULT_RULES, workers=None, rounds_per_worker=100_000,
+                 seats=1, base_bet=10, progress_interval=1.0, on_progress=None, target_stderr=None):
+    """
+    Simulate one strategy in a process pool, reading live progress from shared memory.
+    Args:
+        strategy_name (str): Name of the strategy.
+        make_strategy (callable): Picklable make_strategy(engine) -> player_input_strategy.
+        rules (RuleSet, optional): The rule variant to play. Defaults to DEFAULT_RULES.
+        workers (int, optional): Worker processes. Defaults to os.cpu_count().
+        rounds_per_worker (int, optional): Upper bound on rounds per worker. Defaults to 100,000.
+        seats (int, optional): Players per table. Defaults to 1.
+        base_bet (int, optional): Flat bet the strategy places. Defaults to 10.
+        progress_interval (float, optional): Seconds between progress reads. Defaults to 1.0.
+        on_progress (callable, optional): Called as on_progress(totals, rounds_per_second) after each read.
+        target_stderr (float, optional): Stop every worker once the EV standard error, in base
+            bets, falls to this. Runs to rounds_per_worker when None.
+    Returns:
+        dict: The final SharedCounters.aggregate totals, plus elapsed seconds.
+    """
+    workers = workers or os.cpu_count() or 1
+    counters = SharedCounters(workers)
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = {
+                pool.submit(_parallel_worker, counters.name, workers, slot, strategy_name,
+                            make_strategy, rules, rounds_per_worker, seats)
+                for slot in range(workers)
+            }
+            while pending:
+                done, pending = wait(pending, timeout=progress_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+                totals = counters.aggregate(base_bet)
+                if on_progress is not None:
+                    on_progress(totals, totals['rounds'] / (time.perf_counter() - started))
+                if target_stderr is not None and totals['hands'] > 1 and totals['stderr'] <= target_stderr:
+                    counters.request_stop()
+        totals = counters.aggregate(base_bet)
+        totals['elapsed'] = time.perf_counter() - started
+        return totals
+    finally:
+        counters.close()
@@ -0,0 +1,158 @@
+import json
+import os
+import zlib
+
+from blackjack_rules import RuleSet, is_blackjack
+from card import Card
+from game_engine import GameEngine
+from player import Player
+
+MAGIC = b'BJSNAP'
+VERSION = 1
+# Phases in which no round is in progress
+IDLE_PHASES = ('idle', 'results')
+# Phases reached after naturals were settled, so those hands are already paid
+NATURALS_SETTLED_PHASES = ('dealing', 'player_action', 'dealer')
+
+_CARD_CODES = None
+
+
+def card_code(card):
+    """Return the index of a card in Card.standard_deck()."""
+    global _CARD_CODES
+    if _CARD_CODES is None:
+        _CARD_CODES = {(deck_card.suit, deck_card.rank): code for code, deck_card in enumerate(Card.standard_deck())}
+    return _CARD_CODES[(card.suit, card.rank)]
+
+
+def encode_cards(cards):
+    """Encode cards as one byte each, hex encoded for JSON."""
+    return bytes(card_code(card) for card in cards).hex()
+
+
+def decode_cards(text):
+    """Decode encode_cards output back into the shared standard deck Card instances."""
+    deck = Card.standard_deck()
+    return [deck[code] for code in bytes.fromhex(text)]
+
+
+def snapshot_table(engine):
+    """
+    Capture a table's state.
+    Args:
+        engine (GameEngine): The table.
+    Returns:
+        dict: Players, chips, hands, shoe order, phase, round number and rules, plus the
+            players still holding a reserved seat from an earlier restore.
+    """
+    rules = engine.rules
+    return {
+        'table_id': engine.table_id,
+        'round': engine.current_round,
+        'phase': engine.phase,
+        'rules': {
+            'dealer_rule': rules.dealer_rule,
+            'blackjack_payout': rules.blackjack_payout,
+            'double_on': rules.double_on,
+            'decks': rules.decks,
+        },
+        'players': [
+            {
+                'name': player.name,
+                'chips': player.chips,
+                'hand': encode_cards(player.hand),
+                'current_bet': player.current_bet,
+                'must_stand': player.mustStand,
+                'actions': player.actions,
+            } for player in engine.players
+        ],
+        # Restored players who have not reconnected yet keep their seat across further saves
+        'reserved': [{'name': player.name, 'chips': player.chips} for player in engine.reserved_seats.values()],
+        'dealer': encode_cards(engine.dealer.hand),
+        'shoe': encode_cards(engine.deck.cards),
+    }
+
+
+def restore_table(state, ledger=None):
+    """
+    Rebuild a GameEngine from snapshot_table output.
+    The table resumes at the next betting phase. A round that was interrupted mid-play is
+    voided and its bets are refunded, except for hands already settled as naturals.
+    Args:
+        state (dict): The table state.
+        ledger (ChipLedger, optional): Ledger for the restored players. Defaults to None.
+    Returns:
+        GameEngine: The restored table, with its players in engine.reserved_seats until they reattach.
+    """
+    rules_state = state['rules']
+    rules = RuleSet(
+        rules_state['dealer_rule'],
+        rules_state['blackjack_payout'],
+        rules_state['double_on'],
+        rules_state['decks'],
+    )
+    engine = GameEngine(table_id=state['table_id'], ledger=ledger, rules=rules)
+    engine.current_round = state['round']
+    engine.deck.cards = decode_cards(state['shoe'])
+    engine.deck.composition.rebuild(engine.deck.cards)
+    # Hands are saved for inspection only: a settled round is over, and an interrupted one is voided
+    voided = state['phase'] not in IDLE_PHASES
+    naturals_settled = state['phase'] in NATURALS_SETTLED_PHASES
+    dealer_natural = naturals_settled and is_blackjack(decode_cards(state['dealer']))
+    for player_state in state['players']:
+        player = Player(player_state['name'], player_state['chips'], ledger)
+        settled = naturals_settled and (dealer_natural or is_blackjack(decode_cards(player_state['hand'])))
+        if voided and player_state['current_bet'] and not settled:
+            player.chips += player_state['current_bet']
+            player.record_chips('refund', player_state['current_bet'])
+        engine.reserved_seats[player.name] = player
+    for player_state in state.get('reserved', []):
+        engine.reserved_seats[player_state['name']] = Player(player_state['name'], player_state['chips'], ledger)
+    engine.phase = 'idle'
+    return engine
+
+
+def save_snapshot(path, engines):
+    """
+    Write a versioned, compressed snapshot of every table, replacing path atomically.
+    Args:
+        path (str): The snapshot file.
+        engines (iterable[GameEngine]): The tables to save.
+    Returns:
+        int: Bytes written.
+    """
+    payload = json.dumps(
+        {'version': VERSION, 'tables': [snapshot_table(engine) for engine in engines]},
+        separators=(',', ':'),
+    ).encode()
+    data = MAGIC + bytes([VERSION]) + zlib.compress(payload, 6)
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary_path, path)
+    return len(data)
+
+
+def load_snapshot(path, ledger=None):
+    """
+    Read a snapshot written by save_snapshot.
+    Args:
+        path (str): The snapshot file.
+        ledger (ChipLedger, optional): Ledger for restored players. Defaults to None.
+    Returns:
+        list[GameEngine]: The restored tables (empty if the file does not exist).
+    """
+    try:
+        with open(path, 'rb') as handle:
+            data = handle.read()
+    except FileNotFoundError:
+        return []
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a table snapshot")
+    version = data[len(MAGIC)]
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} (expected {VERSION})")
+    state = json.loads(zlib.decompress(data[len(MAGIC) + 1:]))
+    return [restore_table(table, ledger) for table in state['tables']]
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# Modules are imported by bare name, as when running main.py from this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from player import Player  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def no_deal_delay(monkeypatch):
+    """Deal without the pause meant for terminal players."""
+    monkeypatch.setattr(Player, 'DEAL_DELAY', 0)
@@ -0,0 +1,30 @@
+import pytest
+
+from batch_strategy import DOUBLE_OR_HIT, DOUBLE_OR_STAND, HIT, STAND, basic_strategy_table, policy_index
+
+
+@pytest.mark.parametrize('total, soft, upcard, expected', [
+    # Hard totals
+    (9, False, 2, HIT),
+    (9, False, 3, DOUBLE_OR_HIT),
+    (11, False, 10, DOUBLE_OR_HIT),
+    (12, False, 3, HIT),
+    (12, False, 4, STAND),
+    (16, False, 7, HIT),
+    # Soft doubles widen as the soft total grows
+    (13, True, 4, HIT),
+    (13, True, 5, DOUBLE_OR_HIT),
+    (14, True, 4, HIT),
+    (15, True, 4, DOUBLE_OR_HIT),
+    (16, True, 3, HIT),
+    (16, True, 4, DOUBLE_OR_HIT),
+    (17, True, 2, HIT),
+    (17, True, 3, DOUBLE_OR_HIT),
+    (17, True, 7, HIT),
+    (18, True, 3, DOUBLE_OR_STAND),
+    (18, True, 7, STAND),
+    (18, True, 9, HIT),
+    (19, True, 6, STAND),
+])
+def test_basic_strategy_cells(total, soft, upcard, expected):
+    assert basic_strategy_table()[policy_index(total, soft, upcard)] == expected
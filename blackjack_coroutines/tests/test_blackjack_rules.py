@@ -0,0 +1,59 @@
+import pytest
+
+from blackjack_rules import DEFAULT_RULES, MAX_TABLE_TOTAL, RuleSet
+from card import Card
+
+
+def hand(*ranks):
+    return [Card('Hearts', rank) for rank in ranks]
+
+
+@pytest.mark.parametrize('blackjack_payout, bet, payout', [
+    (1.5, 10, 25),  # 3:2
+    (1.5, 20, 50),
+    (1.2, 10, 22),  # 6:5
+    (1.2, 25, 55),
+])
+def test_blackjack_payouts(blackjack_payout, bet, payout):
+    rules = RuleSet(blackjack_payout=blackjack_payout)
+    assert rules.calculate_payout(bet, 'blackjack') == payout
+    assert rules.calculate_payout(bet, 'win') == 2 * bet
+    assert rules.calculate_payout(bet, 'push') == bet
+    assert rules.calculate_payout(bet, 'lose') == 0
+
+
+@pytest.mark.parametrize('dealer_rule, soft_17, hard_17', [
+    ('S17', False, False),
+    ('H17', True, False),
+    ('A17', True, True),
+])
+def test_dealer_decision_on_17(dealer_rule, soft_17, hard_17):
+    rules = RuleSet(dealer_rule=dealer_rule)
+    assert rules.dealer_should_hit(hand('A', '6')) is soft_17
+    assert rules.dealer_should_hit(hand('10', '7')) is hard_17
+    # Every rule hits 16 and stands on 18, soft or hard
+    assert rules.dealer_should_hit(hand('10', '6'))
+    assert rules.dealer_should_hit(hand('A', '5'))
+    assert not rules.dealer_should_hit(hand('A', '7'))
+    assert not rules.dealer_should_hit(hand('10', '8'))
+
+
+def test_default_rules_double_on_9_to_11():
+    assert [DEFAULT_RULES.can_double_down(hand('5', rank)) for rank in ('3', '4', '5', '6', '7')] == \
+        [False, True, True, True, False]
+    assert not DEFAULT_RULES.can_double_down(hand('2', '3', '5'))
+
+
+@pytest.mark.parametrize('double_on, doubles_anything', [(None, True), ((), False)])
+def test_open_and_empty_double_on_only_change_doubling(double_on, doubles_anything):
+    rules = RuleSet(double_on=double_on)
+    # Payouts and the dealer's play are those of DEFAULT_RULES
+    assert rules.payout_multipliers == DEFAULT_RULES.payout_multipliers
+    assert rules.dealer_hit_table == DEFAULT_RULES.dealer_hit_table
+    # None allows doubling on any two cards and () on none, never on three
+    assert rules.double_table == (doubles_anything,) * (MAX_TABLE_TOTAL + 1)
+    assert rules.can_double_down(hand('10', '8')) is doubles_anything
+    assert rules.can_double_down(hand('5', '5')) is doubles_anything
+    assert not rules.can_double_down(hand('2', '3', '5'))
+    expected = ['hit', 'stand', 'double'] if doubles_anything else ['hit', 'stand']
+    assert rules.get_valid_actions(hand('5', '6'), hand('10', '7')) == expected
@@ -0,0 +1,56 @@
+from card import Deck, ShoeComposition
+
+
+def hi_lo(cards):
+    return sum(ShoeComposition.HI_LO[card.rank] for card in cards)
+
+
+def test_counts_follow_known_draws():
+    deck = Deck()
+    order = ['2', '5', 'K', 'A', '7', '10', '3', '6', '4']  # +1 +1 -1 -1 0 -1 +1 +1 +1
+    dealt = [card for rank in order for card in deck.cards if card.rank == rank and card.suit == 'Hearts']
+    # Same cards, reordered so they come out in order
+    deck.cards = [card for card in deck.cards if card not in dealt] + list(reversed(dealt))
+    for card in dealt:
+        assert deck.deal_card() is card
+    composition = deck.composition
+    assert composition.running_count == 2
+    assert composition.cards_remaining == 43
+    assert composition.tens_remaining == 14
+    assert composition.count_of('A') == 3
+    assert composition.true_count() == 2 / (43 / 52)
+
+
+def test_true_count_divides_by_decks_left():
+    deck = Deck(decks=6)
+    dealt = [deck.deal_card() for _ in range(104)]
+    composition = deck.composition
+    assert composition.running_count == hi_lo(dealt)
+    assert composition.true_count() == hi_lo(dealt) / 4
+
+
+def test_reset_and_reshuffle_zero_the_count():
+    deck = Deck()
+    for _ in range(10):
+        deck.deal_card()
+    deck.reset()
+    assert deck.composition.running_count == 0
+    assert deck.composition.cards_remaining == 52
+    # Running out reshuffles a full deck, so only the card just dealt is counted
+    deck.cards = deck.cards[:1]
+    deck.shuffle()
+    deck.deal_card()
+    card = deck.deal_card()
+    assert deck.composition.running_count == hi_lo([card])
+    assert deck.composition.cards_remaining == 51
+
+
+def test_shuffle_recounts_a_directly_edited_shoe():
+    deck = Deck()
+    removed = [card for card in deck.cards if card.rank in ('2', '3', '4')]
+    deck.cards = [card for card in deck.cards if card.rank not in ('2', '3', '4')]
+    deck.shuffle()
+    assert deck.composition.running_count == 12
+    assert deck.composition.count_of('2') == 0
+    assert deck.composition.cards_remaining == 40
+    assert deck.composition.snapshot()['running_count'] == hi_lo(removed)
@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+import pytest
+
+from card import Card
+from compression import PRESET_DICTIONARY, FrameCompressor, FrameDecompressor
+
+
+def read_frames(data, count, max_frame_bytes=None):
+    """Decompress count frames from data with one FrameDecompressor, as a client would."""
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        decompressor = FrameDecompressor()
+        return [await decompressor.read_frame(reader, max_frame_bytes) for _ in range(count + 1)]
+    return asyncio.run(read())
+
+
+def state_frame(round_number):
+    cards = ' | '.join(str(card) for card in Card.standard_deck()[round_number:round_number + 3])
+    return (json.dumps({"type": "state", "phase": "dealing", "players": [
+        {"name": "alice", "chips": 990, "current_bet": 10, "hand": cards}], "round": round_number}) + '\n').encode()
+
+
+def test_frames_round_trip_through_shared_history():
+    frames = [state_frame(number) for number in range(5)]
+    compressor = FrameCompressor()
+    data = b''.join(compressor.compress(frame) for frame in frames)
+    # The last read hits the end of the stream
+    assert read_frames(data, len(frames)) == frames + [None]
+    # The preset dictionary and shared history shrink repeated state well below the JSON size
+    assert len(data) < sum(map(len, frames)) / 2
+
+
+def test_preset_dictionary_covers_protocol_keys():
+    assert b'"type": "state"' in PRESET_DICTIONARY
+    assert str(Card.standard_deck()[0]).encode() in PRESET_DICTIONARY
+
+
+def test_oversized_frame_is_rejected():
+    data = FrameCompressor().compress(b'x' * 1000 + b'\n')
+    with pytest.raises(ValueError):
+        read_frames(data, 1, max_frame_bytes=100)
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from card import Card
+from game_engine import GameEngine, create_players
+from host import play_game_round_phases
+from network import AsyncServer
+
+
+class RecordingLedger:
+    """Stands in for ChipLedger, keeping every chip movement."""
+
+    def __init__(self):
+        self.entries = []
+
+    def balance(self, player):
+        return 1000
+
+    def record(self, player, kind, amount, balance):
+        self.entries.append((kind, amount))
+
+
+def card(rank):
+    return Card('Spades', rank)
+
+
+def rig(engine, player_cards, dealer_cards, draws=('5', '5', '5')):
+    """Make the deck deal player_cards, then the dealer's upcard and hole card, then draws."""
+    order = list(player_cards) + list(dealer_cards) + list(draws)
+    engine.deck.cards = [card(rank) for rank in reversed(order)]
+
+
+async def bet_ten(prompt):
+    return '10'
+
+
+async def no_action(prompt):
+    raise AssertionError(f"unexpected action request: {prompt}")
+
+
+def play_engine_round(engine):
+    asyncio.run(engine.play_round({'alice': bet_ten}))
+
+
+def play_host_round(engine):
+    # The networked round starts from a fresh deck; keep the rigged one
+    engine.deck.reset = lambda: None
+    asyncio.run(play_game_round_phases(engine, AsyncServer(), {'alice': bet_ten}, {'alice': no_action}))
+
+
+@pytest.fixture(params=[play_engine_round, play_host_round], ids=['engine', 'host'])
+def play(request):
+    return request.param
+
+
+@pytest.mark.parametrize('player_cards, dealer_cards, chips, payout', [
+    (('A', 'K'), ('10', '6'), 1015, 25),   # player blackjack pays 3:2; the dealer's 16 stays put
+    (('10', '9'), ('A', 'K'), 990, None),  # dealer blackjack takes the bet and nobody acts
+    (('A', 'Q'), ('A', 'K'), 1000, 10),    # blackjack against blackjack pushes
+])
+def test_naturals_settle_once(play, player_cards, dealer_cards, chips, payout):
+    ledger = RecordingLedger()
+    engine = GameEngine(ledger=ledger)
+    engine.players = create_players(['alice'], ledger)
+    rig(engine, player_cards, dealer_cards)
+    play(engine)
+    expected = [('bet', -10)] + ([('payout', payout)] if payout else [])
+    assert ledger.entries == expected
+    assert engine.players[0].chips == chips
+    assert len(engine.dealer.hand) == 2
@@ -0,0 +1,52 @@
+import asyncio
+
+from card import Card
+from game_engine import GameEngine, create_players
+from host import play_game_round_phases
+from network import AsyncServer
+
+
+def test_timed_out_bettor_sits_out_the_round():
+    engine = GameEngine()
+    engine.players = create_players(['bob', 'afk'])
+    settled = []
+    engine.round_listeners.append(lambda engine, settlements: settled.extend(settlements))
+    action_prompts = []
+
+    async def bet(prompt):
+        return None if prompt.startswith('afk') else '10'
+
+    async def act(prompt):
+        action_prompts.append(prompt)
+        return 'stand'
+
+    bets = {'bob': bet, 'afk': bet}
+    actions = {'bob': act, 'afk': act}
+    asyncio.run(play_game_round_phases(engine, AsyncServer(), bets, actions))
+    afk = engine.players[1]
+    assert afk.hand == []
+    assert afk.chips == 1000
+    assert not any(prompt.startswith('afk') for prompt in action_prompts)
+    assert [player.name for player, _, _ in settled] == ['bob']
+
+
+def test_networked_round_offers_the_rule_sets_double():
+    engine = GameEngine()
+    engine.players = create_players(['bob'])
+    order = ['5', '6', '10', '8', '9']  # bob's 11, the dealer's 18, bob's double card
+    engine.deck.cards = [Card('Clubs', rank) for rank in reversed(order)]
+    engine.deck.reset = lambda: None
+    prompts = []
+
+    async def bet(prompt):
+        return '10'
+
+    async def act(prompt):
+        prompts.append(prompt)
+        return 'double'
+
+    asyncio.run(play_game_round_phases(engine, AsyncServer(), {'bob': bet}, {'bob': act}))
+    bob = engine.players[0]
+    assert prompts == ["bob, choose your action (hit, stand, double): "]
+    assert bob.actions == ['double']
+    assert bob.chips == 1020
@@ -0,0 +1,45 @@
+import sqlite3
+
+import pytest
+
+from ledger import ChipLedger
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(ChipLedger, 'RETRY_DELAY', 0.001)
+    monkeypatch.setattr(ChipLedger, 'MAX_RETRY_DELAY', 0.001)
+
+
+def fail_writes(monkeypatch, times):
+    """Make the next `times` batch commits raise like a locked database."""
+    original = ChipLedger._write_batch
+    remaining = {'failures': times}
+
+    def flaky(self, connection, batch):
+        if remaining['failures'] != 0:
+            remaining['failures'] -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return original(self, connection, batch)
+
+    monkeypatch.setattr(ChipLedger, '_write_batch', flaky)
+
+
+def test_failed_batches_are_retried_not_lost(tmp_path, monkeypatch):
+    fail_writes(monkeypatch, 3)
+    path = str(tmp_path / 'chips.db')
+    ledger = ChipLedger(path, max_latency=0.0)
+    ledger.record('a', 'bet', -10, 990)
+    ledger.close()
+    assert ledger.errors == 3
+    assert ChipLedger(path).balance('a') == 990
+
+
+def test_flush_raises_instead_of_hanging(tmp_path, monkeypatch):
+    fail_writes(monkeypatch, -1)
+    ledger = ChipLedger(str(tmp_path / 'chips.db'))
+    ledger.record('a', 'bet', -10, 990)
+    with pytest.raises(RuntimeError, match="database is locked"):
+        ledger.flush()
+    with pytest.raises(RuntimeError, match="1 uncommitted entries"):
+        ledger.close()
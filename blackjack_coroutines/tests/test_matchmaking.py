@@ -0,0 +1,105 @@
+import pytest
+
+import matchmaking
+from game_engine import GameEngine, MAX_PLAYERS, create_players
+from host import sync_seats
+from matchmaking import Matchmaker, balance_priority
+from network import AsyncServer
+
+
+class Clock:
+    """Replaces time.monotonic in matchmaking so waits are exact."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(matchmaking.time, 'monotonic', clock)
+    return clock
+
+
+def connect(server, *names):
+    """Register names as connected players, as handle_message does on join."""
+    for name in names:
+        writer = object()
+        server.clients[writer] = name
+        server.writers[name] = writer
+        for listener in server.join_listeners:
+            listener(name)
+
+
+def disconnect(server, name):
+    del server.clients[server.writers.pop(name)]
+
+
+def test_higher_priority_goes_first_but_long_waits_win(clock):
+    server = AsyncServer()
+    priorities = {'vip': 1}
+    matchmaker = Matchmaker(server, priority_of=lambda name: priorities.get(name, 0), priority_boost=30.0)
+    connect(server, 'early')
+    clock.now += 40  # longer than one priority level is worth
+    connect(server, 'late')
+    connect(server, 'vip')
+    assert matchmaker.take(3) == ['early', 'vip', 'late']
+    assert matchmaker.stats()['by_priority'] == {
+        0: {'seated': 2, 'mean_wait_s': 20.0},
+        1: {'seated': 1, 'mean_wait_s': 0.0},
+    }
+
+
+def test_ties_keep_join_order(clock):
+    server = AsyncServer()
+    matchmaker = Matchmaker(server)
+    connect(server, 'c', 'a', 'b')
+    connect(server, 'a')  # joining twice keeps the original place
+    assert matchmaker.take(2) == ['c', 'a']
+    assert matchmaker.take(2) == ['b']
+    assert matchmaker.take(2) == []
+
+
+def test_disconnected_players_are_skipped(clock):
+    server = AsyncServer()
+    matchmaker = Matchmaker(server)
+    connect(server, 'gone', 'here')
+    disconnect(server, 'gone')
+    assert [name for name, _ in matchmaker.waiting()] == ['here']
+    assert matchmaker.take(2) == ['here']
+
+
+def test_sync_seats_fills_free_seats_and_leaves_the_rest_waiting(clock):
+    server = AsyncServer()
+    matchmaker = Matchmaker(server)
+    engine = GameEngine()
+    connect(server, 'seated')
+    engine.players = create_players(matchmaker.take(1))
+    connect(server, 'a', 'b', 'c')
+    new_names = sync_seats(engine, server, None, {}, {}, matchmaker)
+    assert new_names == ['a', 'b']
+    assert len(engine.players) == MAX_PLAYERS
+    assert [name for name, _ in matchmaker.waiting()] == ['c']
+    # A seat freed by a disconnect goes to the next in line
+    disconnect(server, 'a')
+    assert sync_seats(engine, server, None, {}, {}, matchmaker) == ['c']
+    assert [player.name for player in engine.players] == ['seated', 'b', 'c']
+
+
+def test_balance_priority_seats_bigger_stacks_sooner(clock, tmp_path):
+    from ledger import ChipLedger
+    ledger = ChipLedger(str(tmp_path / 'chips.db'))
+    ledger.record('whale', 'payout', 4000, 5000)
+    ledger.record('minnow', 'bet', -900, 100)
+    try:
+        priority_of = balance_priority(ledger)
+        assert [priority_of(name) for name in ('whale', 'minnow', 'newcomer')] == [5, 0, 1]
+        server = AsyncServer()
+        matchmaker = Matchmaker(server, priority_of=priority_of)
+        connect(server, 'minnow', 'newcomer', 'whale')
+        assert matchmaker.take(3) == ['whale', 'newcomer', 'minnow']
+    finally:
+        ledger.close()
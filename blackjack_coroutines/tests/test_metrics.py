@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+from game_engine import GameEngine, create_players
+from metrics import Metrics, metrics
+from network import AsyncServer
+
+
+def test_one_table_is_profiled_at_a_time():
+    metrics = Metrics()
+    metrics.request_profile('a')
+    metrics.request_profile('b')
+    profiler = metrics.start_profile('a')
+    try:
+        assert profiler is not None
+        assert metrics.start_profile('b') is None
+    finally:
+        metrics.stop_profile('a', profiler)
+    # b's request waited rather than being lost
+    profiler = metrics.start_profile('b')
+    assert profiler is not None
+    metrics.stop_profile('b', profiler)
+    assert metrics.profile_report('b')
+
+
+def stats_request(server, line):
+    """Send one request line to server's stats endpoint and return the raw answer."""
+    async def request():
+        listener = await asyncio.start_server(server.handle_stats_client, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(line)
+        answer = await reader.read()
+        writer.close()
+        listener.close()
+        return answer
+    return asyncio.run(request())
+
+
+def test_stats_endpoint_profiles_exactly_one_table(monkeypatch):
+    monkeypatch.setattr(metrics, 'profile_requests', {})
+    monkeypatch.setattr(metrics, 'profiles', {})
+    server = AsyncServer()
+    engines = {table_id: GameEngine(table_id=table_id) for table_id in ('t1', 't2')}
+    for engine in engines.values():
+        server.register_table(engine)
+        engine.players = create_players(['bot'])
+
+    answer = stats_request(server, b'GET /profile?table=t1&rounds=1 HTTP/1.0\r\n\r\n')
+    assert answer.startswith(b'HTTP/1.0 200 OK')
+    assert json.loads(answer.split(b'\r\n\r\n', 1)[1]) == {'profiling': 't1', 'rounds': 1}
+
+    async def respond(prompt):
+        return '10' if 'bet' in prompt else 'stand'
+
+    for engine in engines.values():
+        asyncio.run(engine.play_round({'bot': respond}))
+    assert set(metrics.profiles) == {'t1'}
+    report = stats_request(server, b'/profile/report?table=t1\n')
+    assert b'function calls' in report
+    assert stats_request(server, b'/profile/report?table=t2\n') == b'\n'
+
+
+def test_stats_endpoint_rejects_unknown_tables():
+    answer = stats_request(AsyncServer(), b'GET /profile?table=nope HTTP/1.0\r\n\r\n')
+    assert answer.startswith(b'HTTP/1.0 404 Not Found')
+    # Any other request still gets the stats snapshot
+    assert json.loads(stats_request(AsyncServer(), b'\n'))['tables'] == {}
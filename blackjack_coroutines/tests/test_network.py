@@ -0,0 +1,184 @@
+import asyncio
+import contextlib
+import json
+
+from network import AsyncClient, AsyncServer, MultiplexClient
+
+
+async def send_lines(server, lines):
+    """Serve one connection that sends lines and closes, returning what the server sent back."""
+    done = asyncio.Event()
+
+    async def handle(reader, writer):
+        try:
+            await server.handle_client(reader, writer)
+        finally:
+            done.set()
+
+    listener = await asyncio.start_server(handle, '127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b''.join(lines))
+    await writer.drain()
+    writer.write_eof()
+    try:
+        replies = await reader.read()
+    except ConnectionResetError:
+        # The server closed the connection with input still unread
+        replies = b''
+    await asyncio.wait_for(done.wait(), 5)
+    writer.close()
+    listener.close()
+    return replies
+
+
+@contextlib.asynccontextmanager
+async def running(server):
+    """Run server on a free local port, yielding that port."""
+    server.host, server.port = '127.0.0.1', 0
+    task = asyncio.create_task(server.start())
+    while server.server is None or not server.server.sockets:
+        await asyncio.sleep(0.01)
+    try:
+        yield server.server.sockets[0].getsockname()[1]
+    finally:
+        server.server.close()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def test_rate_limited_frames_are_dropped_before_decoding(monkeypatch):
+    server = AsyncServer(message_rate=0.001, message_burst=2, max_rate_violations=100)
+    decoded = []
+    decode = server.decode_message
+    monkeypatch.setattr(server, 'decode_message', lambda line: decoded.append(line) or decode(line))
+    asyncio.run(send_lines(server, [b'{"type": "ping"}\n'] * 10))
+    assert len(decoded) == 2
+    assert server.abuse_counters['rate_limited'] == 8
+
+
+def test_spectator_cannot_join():
+    server = AsyncServer(message_rate=None)
+    replies = asyncio.run(send_lines(server, [b'{"type": "spectate"}\n', b'{"type": "join", "name": "eve"}\n']))
+    assert b'Spectators cannot join.' in replies
+    assert 'eve' not in server.writers
+
+
+def test_compressed_exchange_and_repeated_hello():
+    async def exchange():
+        server = AsyncServer(compression=True, message_rate=None)
+        async with running(server) as port:
+            client = AsyncClient(port=port, compression=True)
+            await client.connect()
+            await client.send_message({"type": "join", "name": "alice"})
+            joined = await asyncio.wait_for(client.recv_message(), 5)
+            assert client.decompressor is not None
+            # A second hello is refused through the compressor instead of desyncing the stream
+            await client.send_message({"type": "hello", "compression": "zlib"})
+            refused = await asyncio.wait_for(client.recv_message(), 5)
+            client.writer.close()
+            return joined, refused, server.compression_stats['frames']
+    joined, refused, frames = asyncio.run(exchange())
+    assert joined == {"type": "join_ack", "players": ["alice"]}
+    assert refused["type"] == "error"
+    assert frames >= 2
+
+
+def test_hello_after_spectate_is_refused():
+    server = AsyncServer(compression=True, message_rate=None)
+    replies = asyncio.run(send_lines(server, [b'{"type": "spectate"}\n', b'{"type": "hello", "compression": "zlib"}\n']))
+    assert b'hello_ack' not in replies
+    assert b'Hello must come first and only once.' in replies
+
+
+def test_line_after_idle_expiry_is_not_an_error(monkeypatch, capsys):
+    server = AsyncServer(idle_timeout=30.0, message_rate=None)
+    recv_line = server.recv_line
+
+    async def recv_then_expire(reader):
+        # The idle timer fires just as a line arrives
+        line = await recv_line(reader)
+        for writer in list(server.idle_timers):
+            server.expire_idle(writer)
+        return line
+
+    monkeypatch.setattr(server, 'recv_line', recv_then_expire)
+    asyncio.run(send_lines(server, [b'{"type": "ping"}\n']))
+    assert '[Server] Error' not in capsys.readouterr().out
+
+
+def test_spectator_picks_a_table():
+    from game_engine import GameEngine
+    server = AsyncServer(message_rate=None)
+    server.register_table(GameEngine(table_id='table-1'))
+    server.register_table(GameEngine(table_id='table-2'))
+    replies = asyncio.run(send_lines(server, [b'{"type": "spectate", "table": "table-2"}\n']))
+    ack = json.loads(replies.split(b'\n')[0])
+    assert ack == {"type": "spectate_ack", "table": "table-2", "tables": ["table-1", "table-2"]}
+    assert "table-2" in server.state_streams
+
+
+def test_sessions_multiplexed_over_one_connection():
+    async def play():
+        server = AsyncServer(max_sessions=10, message_rate=None)
+        async with running(server) as port:
+            client = MultiplexClient(port=port)
+            await client.connect()
+            sessions = {name: client.open_session() for name in ('a', 'b', 'c')}
+            for name, session in sessions.items():
+                await session.send_message({"type": "join", "name": name})
+            acks = {name: await asyncio.wait_for(session.recv_message(), 5) for name, session in sessions.items()}
+            assert acks == {name: {"type": "join_ack", "players": [name]} for name in sessions}
+            assert len(server.sessions) == 1
+            assert len(set(server.connections)) == 1
+
+            # Server frames reach only the session they are for, and answers come back routed
+            await server.send_message(server.find_writer('b'), {"type": "bet_request"})
+            assert await asyncio.wait_for(sessions['b'].recv_message(), 5) == {"type": "bet_request"}
+            await sessions['b'].send_message({"type": "bet_response", "amount": "10"})
+            answer = await asyncio.wait_for(server.get_response_queue('b').get(), 5)
+            assert answer["amount"] == "10"
+            assert sessions['a'].inbox.empty() and sessions['c'].inbox.empty()
+
+            # Leaving frees one seat and leaves the others connected
+            await sessions['a'].close()
+            await sessions['c'].send_message({"type": "bet_response", "amount": "5"})
+            assert (await asyncio.wait_for(server.get_response_queue('c').get(), 5))["amount"] == "5"
+            assert sorted(server.writers) == ['b', 'c']
+            await client.close()
+
+    asyncio.run(play())
+
+
+def test_session_rate_limit_is_charged_to_the_envelope_id():
+    server = AsyncServer(max_sessions=10, message_rate=0.001, message_burst=2)
+    nested = b'{"type": "bet_response", "amount": "1", "meta": {"session": 0}, "session": 1}\n'
+    asyncio.run(send_lines(server, [
+        b'{"type": "join", "name": "p0", "session": 0}\n',
+        b'{"type": "join", "name": "p1", "session": 1}\n',
+        nested, nested, nested,  # the third exceeds session 1's burst
+        b'{"type": "bet_response", "amount": "1", "session": 0}\n',
+    ]))
+    assert server.abuse_counters['rate_limited'] == 1
+
+
+def test_unhashable_session_id_rejects_only_that_frame():
+    server = AsyncServer(max_sessions=10, message_rate=None)
+    replies = asyncio.run(send_lines(server, [
+        b'{"type": "join", "name": "x", "session": [1]}\n',
+        b'{"type": "join", "name": "y", "session": 2}\n',
+    ]))
+    assert server.abuse_counters['rejected_sessions'] == 1
+    assert b'Session rejected.' in replies
+    assert b'{"session": 2, "type": "join_ack", "players": ["y"]}' in replies
+
+
+def test_stats_report_each_tables_shoe():
+    from game_engine import GameEngine
+    server = AsyncServer()
+    engine = GameEngine(table_id='t')
+    server.register_table(engine)
+    dealt = [engine.deck.deal_card() for _ in range(5)]
+    shoe = server.get_stats()['tables']['t']['shoe']
+    assert shoe['cards_remaining'] == 47
+    assert shoe['running_count'] == sum(engine.deck.composition.HI_LO[card.rank] for card in dealt)
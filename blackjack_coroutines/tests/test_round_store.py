@@ -0,0 +1,80 @@
+import asyncio
+
+from card import Card
+from game_engine import GameEngine, attach_round_store, create_players, open_round_store_from_env
+from round_store import (OUTCOMES, RoundStoreReader, RoundStoreWriter, decode_actions, decode_hand,
+                         encode_actions, encode_hand)
+
+
+def rows(directory):
+    reader = RoundStoreReader(directory)
+    try:
+        return list(zip(*(reader.column(name).tolist() for name in ('round_id', 'seat', 'bet', 'payout'))))
+    finally:
+        reader.close()
+
+
+def test_write_reopen_and_read_back_across_growth(tmp_path):
+    directory = str(tmp_path / 'rounds')
+    writer = RoundStoreWriter(directory, chunk_rows=4)
+    for row in range(10):  # grows the files twice
+        writer.append(row, row % 3, 10 + row, 0, 0, 0, 2, 20 + row)
+    writer.close()
+    assert rows(directory) == [(row, row % 3, 10 + row, 20 + row) for row in range(10)]
+
+    # Reopening appends after the rows already written
+    writer = RoundStoreWriter(directory, chunk_rows=4)
+    assert writer.count == 10
+    for row in range(10, 15):
+        writer.append(row, 0, 5, 0, 0, 0, 0, 0)
+    writer.close()
+    assert len(RoundStoreReader(directory)) == 15
+    assert rows(directory)[10:] == [(row, 0, 5, 0) for row in range(10, 15)]
+
+
+def test_unflushed_rows_are_invisible_to_readers(tmp_path):
+    directory = str(tmp_path / 'rounds')
+    writer = RoundStoreWriter(directory, chunk_rows=2)
+    writer.append(0, 0, 10, 0, 0, 0, 0, 0)
+    writer.flush()
+    writer.append(1, 0, 10, 0, 0, 0, 0, 0)
+    assert len(RoundStoreReader(directory)) == 1
+    writer.close()
+    assert len(RoundStoreReader(directory)) == 2
+
+
+def test_hand_and_action_codes_round_trip():
+    hand = [Card('Spades', 'A'), Card('Hearts', '7')]
+    assert decode_hand(encode_hand(hand)) == ('A', '7')
+    actions = ['hit', 'hit', 'double', 'stand']
+    assert decode_actions(encode_actions(actions)) == actions
+
+
+def test_env_switch_records_every_settled_hand(tmp_path, monkeypatch):
+    directory = str(tmp_path / 'rounds')
+    monkeypatch.setenv('BLACKJACK_ROUND_STORE', directory)
+    round_store = open_round_store_from_env()
+    engine = GameEngine()
+    settled = []
+    engine.round_listeners.append(lambda engine, settlements: settled.extend(settlements))
+    attach_round_store(engine, round_store)
+    engine.players = create_players(['a', 'b'])
+
+    async def respond(prompt):
+        return '10' if 'bet' in prompt else 'stand'
+
+    asyncio.run(engine.play_round({'a': respond, 'b': respond}))
+    # Published after the round, before the store is closed
+    reader = RoundStoreReader(directory)
+    assert len(reader) == 2
+    assert reader.column('seat').tolist() == [0, 1]
+    assert reader.column('bet').tolist() == [10, 10]
+    assert reader.column('outcome').tolist() == [OUTCOMES.index(result) for _, result, _ in settled]
+    assert reader.column('payout').tolist() == [payout for _, _, payout in settled]
+    reader.close()
+    round_store.close()
+
+
+def test_env_switch_is_off_by_default(monkeypatch):
+    monkeypatch.delenv('BLACKJACK_ROUND_STORE', raising=False)
+    assert open_round_store_from_env() is None
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from batch_strategy import BatchedPolicy
+from card import Card
+from game_engine import GameEngine, create_players
+from simulation import threshold_strategy
+
+
+def guard_prompts(strategy, limit=12):
+    """Fail instead of spinning forever if a seat is asked the same kind of question over and over."""
+    calls = {'bet': 0, 'action': 0}
+
+    def wrap(respond):
+        async def guarded(prompt):
+            kind = 'bet' if 'bet' in prompt else 'action'
+            calls[kind] += 1
+            assert calls[kind] <= limit, f"{kind} requested repeatedly"
+            return await respond(prompt)
+        return guarded
+
+    return {name: wrap(respond) for name, respond in strategy.items()}
+
+
+@pytest.mark.parametrize('make_strategy', [threshold_strategy, BatchedPolicy().strategy_for])
+def test_short_stacked_seat_bets_what_it_has(make_strategy):
+    engine = GameEngine()
+    engine.players = create_players(['Seat0'])
+    engine.players[0].chips = 5
+    engine.deck.shuffle()
+    asyncio.run(engine.play_round(guard_prompts(make_strategy(engine))))
+    assert engine.players[0].current_bet == 5
+
+
+def test_all_in_seat_hits_instead_of_doubling():
+    engine = GameEngine()
+    engine.players = create_players(['Seat0'])
+    engine.players[0].chips = 5
+    order = ['5', '6', '10', '7', '9']  # Seat0's 11 against a 10: basic strategy doubles
+    engine.deck.cards = [Card('Clubs', rank) for rank in reversed(order)]
+    asyncio.run(engine.play_round(guard_prompts(BatchedPolicy().strategy_for(engine))))
+    assert engine.players[0].actions[0] == 'hit'
+    assert engine.players[0].current_bet == 5
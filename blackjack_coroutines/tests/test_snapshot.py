@@ -0,0 +1,21 @@
+from game_engine import GameEngine
+from player import Player
+from snapshot import load_snapshot, save_snapshot
+
+
+def test_reserved_seats_survive_repeated_saves(tmp_path):
+    path = str(tmp_path / 'table.snap')
+    engine = GameEngine(table_id='t1')
+    engine.players = [Player('a', 777), Player('b')]
+    save_snapshot(path, [engine])
+
+    # Restart twice before anyone reconnects
+    restored = load_snapshot(path)[0]
+    save_snapshot(path, [restored])
+    restored = load_snapshot(path)[0]
+
+    assert {name: player.chips for name, player in restored.reserved_seats.items()} == {'a': 777, 'b': 1000}
+
+
+def test_missing_snapshot_restores_nothing(tmp_path):
+    assert load_snapshot(str(tmp_path / 'missing.snap')) == []
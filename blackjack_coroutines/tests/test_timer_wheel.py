@@ -0,0 +1,56 @@
+from timer_wheel import TimerWheel
+
+
+def recording_wheel(**options):
+    """Return a wheel and the list its record callback appends (label, tick) to."""
+    wheel = TimerWheel(**options)
+    fired = []
+    return wheel, fired, lambda label: fired.append((label, wheel.current_tick))
+
+
+def test_schedule_fires_on_the_exact_tick():
+    wheel, fired, record = recording_wheel(tick=0.1)
+    wheel.schedule(0.3, record, 'a')
+    wheel.schedule(0.25, record, 'b')  # rounded up to the next tick
+    wheel.schedule(0, record, 'c')     # never fires on the current tick
+    assert wheel.pending == 3
+    wheel.advance(2)
+    assert fired == [('c', 1)]
+    wheel.advance(1)
+    assert sorted(fired) == [('a', 3), ('b', 3), ('c', 1)]
+    assert wheel.pending == 0
+    assert wheel.fired == 3
+
+
+def test_cancel_and_reschedule():
+    wheel, fired, record = recording_wheel(tick=1.0)
+    cancelled = wheel.schedule(2, record, 'cancelled')
+    moved = wheel.schedule(2, record, 'moved')
+    assert wheel.cancel(cancelled)
+    assert not wheel.cancel(cancelled)
+    wheel.advance(1)
+    moved = wheel.reschedule(moved, 5)
+    assert wheel.pending == 1
+    wheel.advance(5)
+    assert fired == [('moved', 6)]
+    # Cancelling a timer that already fired is a no-op
+    assert not wheel.cancel(moved)
+    assert wheel.pending == 0
+
+
+def test_timers_cascade_across_levels():
+    wheel, fired, record = recording_wheel(tick=1.0, level_sizes=(4, 4, 4))
+    delays = [3, 4, 5, 15, 16, 17, 63, 64, 100]  # level 0, 1, 2 and beyond the horizon
+    for delay in delays:
+        wheel.schedule(delay, record, delay)
+    wheel.advance(110)
+    assert fired == [(delay, delay) for delay in delays]
+
+
+def test_timers_scheduled_mid_turn_cascade_on_time():
+    wheel, fired, record = recording_wheel(tick=1.0, level_sizes=(4, 4, 4))
+    wheel.advance(3)
+    for delay in (2, 6, 13, 30):
+        wheel.schedule(delay, record, delay)
+    wheel.advance(40)
+    assert fired == [(delay, 3 + delay) for delay in (2, 6, 13, 30)]
@@ -0,0 +1,153 @@
+import asyncio
+import time
+
+
+class Timer:
+    __slots__ = ('expires', 'callback', 'args', 'bucket')
+
+    def __init__(self, expires, callback, args):
+        self.expires = expires  # absolute tick
+        self.callback = callback
+        self.args = args
+        self.bucket = None      # the slot dict holding this timer, None once fired or cancelled
+
+
+class TimerWheel:
+    def __init__(self, tick=0.1, level_sizes=(256, 64, 64)):
+        """
+        Initialize a hierarchical timer wheel.
+        Level 0 has one slot per tick; each higher level's slot spans a full turn of the level
+        below. Scheduling and cancelling are O(1); expiries fire in one batch per tick.
+        Args:
+            tick (float, optional): Resolution in seconds. Defaults to 0.1.
+            level_sizes (tuple[int, ...], optional): Slots per level. The defaults cover about
+                29 hours at 0.1s ticks; longer timers wait in the last level.
+        """
+        self.tick = tick
+        self.level_sizes = level_sizes
+        self.levels = [[{} for _ in range(size)] for size in level_sizes]
+        # spans[i] = ticks covered by one slot of level i
+        self.spans = []
+        span = 1
+        for size in level_sizes:
+            self.spans.append(span)
+            span *= size
+        self.horizon = span
+        self.current_tick = 0
+        self.pending = 0
+        self.fired = 0
+        self._started_at = None
+        self._task = None
+
+    def schedule(self, delay, callback, *args):
+        """
+        Call callback(*args) after delay seconds (rounded up to the next tick).
+        Args:
+            delay (float): Seconds from now.
+            callback (callable): Plain function run on the event loop when the timer fires.
+        Returns:
+            Timer: Handle for cancel().
+        """
+        ticks = max(1, -int(-delay // self.tick))
+        timer = Timer(self.current_tick + ticks, callback, args)
+        self._insert(timer)
+        self.pending += 1
+        return timer
+
+    def cancel(self, timer):
+        """
+        Cancel a timer. Safe to call on timers that already fired or were cancelled.
+        Returns:
+            bool: True if the timer was pending.
+        """
+        if timer is None or timer.bucket is None:
+            return False
+        del timer.bucket[timer]
+        timer.bucket = None
+        self.pending -= 1
+        return True
+
+    def reschedule(self, timer, delay):
+        """Cancel timer and schedule its callback again delay seconds from now."""
+        self.cancel(timer)
+        return self.schedule(delay, timer.callback, *timer.args)
+
+    def _insert(self, timer):
+        remaining = timer.expires - self.current_tick
+        for level, size in enumerate(self.level_sizes):
+            span = self.spans[level]
+            if remaining < span * size or level == len(self.level_sizes) - 1:
+                expires = min(timer.expires, self.current_tick + span * size - 1)
+                bucket = self.levels[level][(expires // span) % size]
+                bucket[timer] = None
+                timer.bucket = bucket
+                return
+
+    def advance(self, ticks=1):
+        """
+        Move the wheel forward and fire every timer that expires on the way.
+        Args:
+            ticks (int, optional): Number of ticks to advance. Defaults to 1.
+        Returns:
+            int: Number of timers fired.
+        """
+        fired = 0
+        for _ in range(ticks):
+            self.current_tick += 1
+            self._cascade(1)
+            bucket = self.levels[0][self.current_tick % self.level_sizes[0]]
+            if not bucket:
+                continue
+            expired = []
+            for timer in list(bucket):
+                if timer.expires > self.current_tick:
+                    # Beyond the wheel's horizon when scheduled; wait another turn
+                    del bucket[timer]
+                    self._insert(timer)
+                    continue
+                expired.append(timer)
+            bucket.clear()
+            for timer in expired:
+                timer.bucket = None
+                self.pending -= 1
+            for timer in expired:
+                try:
+                    timer.callback(*timer.args)
+                except Exception as error:
+                    print(f"[Timers] Timer callback failed: {error}")
+            fired += len(expired)
+        self.fired += fired
+        return fired
+
+    def _cascade(self, level):
+        # When a lower level wraps around, move the next slot of this level down a level
+        if level >= len(self.level_sizes) or self.current_tick % self.spans[level]:
+            return
+        self._cascade(level + 1)
+        bucket = self.levels[level][(self.current_tick // self.spans[level]) % self.level_sizes[level]]
+        if not bucket:
+            return
+        timers = list(bucket)
+        bucket.clear()
+        for timer in timers:
+            self._insert(timer)
+
+    async def run(self):
+        """Advance the wheel in real time until cancelled, catching up after slow ticks."""
+        self._started_at = time.monotonic() - self.current_tick * self.tick
+        while True:
+            await asyncio.sleep(self.tick)
+            due = int((time.monotonic() - self._started_at) / self.tick)
+            if due > self.current_tick:
+                self.advance(due - self.current_tick)
+
+    def start(self):
+        """Start advancing the wheel on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self):
+        """Stop advancing the wheel."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None